@@ -2,23 +2,21 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import wmi
-import socket
-import datetime
-import os
 import threading
-import pythoncom  
+import multiprocessing
 
 # Importa las funciones de los otros archivos
-import InfoSystem_backend as backend
 import report_generator as reporter
+import collector
+import instrumentation
+import wmi_cache
 
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
 
         self.title("Generador de Informacion del Sistema")
-        self.geometry("450x550")
+        self.geometry("450x650")
 
         # --- Variables de control ---
         self.info_vars = {}
@@ -37,21 +35,11 @@ class App(tk.Tk):
             "Discos": ("disks",),
             "Sistema Operativo": ("os",),
             "Impresoras": ("printers",),
-            "Programas Instalados (Lento)": ("software",)
+            "Programas Instalados": ("software",)
         }
+        # Win32_Product es opcional: es lento y verifica cada paquete MSI
+        self.software_wmi_var = tk.BooleanVar(value=False)
         
-        self.backend_functions = {
-            "system": backend.get_system_info,
-            "network": backend.get_network_info,
-            "bios": backend.get_bios_info,
-            "cpu": backend.get_cpu_info,
-            "ram": backend.get_ram_info,
-            "disks": backend.get_disk_info,
-            "os": backend.get_os_info,
-            "printers": backend.get_installed_printers,
-            "software": backend.get_installed_software
-        }
-
         # --- Diseño de la Interfaz ---
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -63,6 +51,8 @@ class App(tk.Tk):
             self.info_vars[name] = tk.BooleanVar(value=True)
             cb = ttk.Checkbutton(info_frame, text=name, variable=self.info_vars[name])
             cb.pack(anchor=tk.W, padx=5)
+        cb = ttk.Checkbutton(info_frame, text="Usar Win32_Product para los programas (Lento)", variable=self.software_wmi_var)
+        cb.pack(anchor=tk.W, padx=25)
 
         format_frame = ttk.LabelFrame(main_frame, text="2. Seleccione el formato de salida", padding="10")
         format_frame.pack(fill=tk.X, pady=5)
@@ -70,14 +60,21 @@ class App(tk.Tk):
         for fmt, var in self.format_vars.items():
             cb = ttk.Checkbutton(format_frame, text=fmt, variable=var)
             cb.pack(anchor=tk.W, padx=5)
+        self.trace_var = tk.BooleanVar(value=False)
+        cb = ttk.Checkbutton(format_frame, text="Traza de rendimiento (JSON y pie del reporte)", variable=self.trace_var)
+        cb.pack(anchor=tk.W, padx=5)
             
         action_frame = ttk.Frame(main_frame, padding="10")
         action_frame.pack(fill=tk.X, pady=10)
         
         self.generate_button = ttk.Button(action_frame, text="Generar Reporte", command=self.start_report_generation)
         self.generate_button.pack(fill=tk.X, ipady=5)
+        # Deja de esperar a las secciones pendientes y genera el reporte con lo obtenido
+        self.cancel_event = threading.Event()
+        self.cancel_button = ttk.Button(action_frame, text="Cancelar", command=self.cancel_report_generation, state=tk.DISABLED)
+        self.cancel_button.pack(fill=tk.X, pady=(5, 0))
         
-        self.progress_bar = ttk.Progressbar(main_frame, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate')
         self.progress_bar.pack(fill=tk.X, pady=5)
 
         self.status_label = ttk.Label(main_frame, text="Listo para generar el reporte.")
@@ -96,49 +93,63 @@ class App(tk.Tk):
             return
 
         self.generate_button.config(state=tk.DISABLED)
+        self.cancel_event.clear()
+        self.cancel_button.config(state=tk.NORMAL)
         self.status_label.config(text="Iniciando recolección de datos...")
-        self.progress_bar.start()
+        self.progress_bar.config(value=0)
 
         thread = threading.Thread(target=self.run_report_logic)
         thread.start()
 
+    def cancel_report_generation(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Cancelando: se generará un reporte parcial...")
+
     def run_report_logic(self):
        
-        pythoncom.CoInitialize()
         try:
-            self.status_label.config(text="Conectando con WMI...")
-            c = wmi.WMI()
-            
-            all_data = {}
-            for name, var in self.info_vars.items():
-                if var.get():
-                    self.status_label.config(text=f"Obteniendo: {name}...")
-                    if name == "Discos":
-                        all_data['disks'] = backend.get_disk_info()
-                    else:
-                        for key in self.info_options[name]:
-                            all_data[key] = self.backend_functions[key](c)
+            self.status_label.config(text="Obteniendo información del sistema...")
+            software_source = "wmi" if self.software_wmi_var.get() else "registry"
+            keys = [key for name, var in self.info_vars.items() if var.get() for key in self.info_options[name]]
+            formats = [fmt for fmt, var in self.format_vars.items() if var.get()]
+
+            # La barra avanza con cada colector y cada formato terminados
+            self.progress_bar.config(maximum=len(keys) + len(formats), value=0)
+            trace = instrumentation.Trace()
+            def on_event(event):
+                if event["phase"] != "end": return
+                self.progress_bar.step(1)
+                done = len(trace.collectors) if event["type"] == "collector" else len(trace.renderers)
+                if event["type"] == "collector": self.status_label.config(text=f"Obteniendo información... ({done}/{len(keys)})")
+                else: self.status_label.config(text=f"Generando archivos de reporte... ({done}/{len(formats)})")
+            trace.subscribe(on_event)
+
+            # Cada sección se recolecta en su propio hilo; las conexiones WMI salen del pool
+            # y las consultas repetidas (p. ej. Win32_ComputerSystem) se comparten durante el reporte.
+            # Una sección que supera su plazo o sigue pendiente al cancelar queda marcada como incompleta
+            all_data = collector.collect(keys, cache=wmi_cache.QueryCache(), trace=trace, cancel=self.cancel_event,
+                                         software_source=software_source)
+            self.cancel_button.config(state=tk.DISABLED)
+            incomplete = collector.incomplete_sections(all_data)
 
             self.status_label.config(text="Generando archivos de reporte...")
-            hostname = socket.gethostname()
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            base_filename = f"reporte_sistema_{hostname}_{timestamp}"
+            base_filename = reporter.default_base_filename()
             
-            generated_files = []
-            if self.format_vars["HTML"].get():
-                filename = f"{base_filename}.html"
-                reporter.generate_html(all_data, filename)
-                generated_files.append(filename)
-            if self.format_vars["PDF"].get():
-                filename = f"{base_filename}.pdf"
-                reporter.generate_pdf(all_data, filename)
-                generated_files.append(filename)
-            if self.format_vars["Excel"].get():
-                filename = f"{base_filename}.xlsx"
-                reporter.generate_excel(all_data, filename)
-                generated_files.append(filename)
-
-            messagebox.showinfo("Éxito", f"Reporte(s) generado(s) exitosamente:\n\n" + "\n".join(generated_files))
+            # Cada formato se genera en su propio proceso a partir de los mismos datos
+            footer = trace.footer_lines() if self.trace_var.get() else None
+            generated_files, errors = reporter.generate_reports(all_data, base_filename, formats, trace=trace, footer=footer)
+            if self.trace_var.get():
+                trace.save(f"{base_filename}_traza.json")
+                generated_files.append(f"{base_filename}_traza.json")
+
+            if errors or incomplete:
+                failed = "\n".join(f"{fmt}: {error}" for fmt, error in errors.items())
+                details = f"\n\nFormatos con error:\n\n{failed}" if errors else ""
+                if incomplete: details += f"\n\nSecciones incompletas: {', '.join(incomplete)}"
+                messagebox.showwarning("Reporte incompleto", "Reporte(s) generado(s):\n\n" + ("\n".join(generated_files) or "Ninguno") + details)
+            else:
+                messagebox.showinfo("Éxito", f"Reporte(s) generado(s) exitosamente:\n\n" + "\n".join(generated_files))
         
         except Exception as e:
             messagebox.showerror("Error Crítico", f"Ocurrió un error inesperado:\n{e}")
@@ -146,13 +157,15 @@ class App(tk.Tk):
         finally:
            
             self.after(100, self.reset_ui)
-            pythoncom.CoUninitialize()
 
     def reset_ui(self):
-        self.progress_bar.stop()
+        self.progress_bar.config(value=0)
         self.status_label.config(text="Listo para generar el reporte.")
         self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
 
 if __name__ == "__main__":
+    # Necesario para los procesos de generate_reports en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
     app = App()
     app.mainloop()
\ No newline at end of file
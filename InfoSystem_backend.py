@@ -1,78 +1,121 @@
 # InfoSystem_backend.py
 
-import wmi
 import socket
 import os
 import platform
 import re
 
+import instrumentation
+import software_inventory
+from tabular import Table
+from wmi_query import WQLQuery, records
+
+# Origen por defecto del inventario de software: "registry" o "wmi" (Win32_Product).
+# Para otro origen se usa collect(software_source=...), no se modifica esta constante
+SOFTWARE_SOURCE = "registry"
+
 # --- Todas tus funciones de obtención de datos van aquí ---
 # (get_system_info, get_bios_info, get_os_info, etc.)
 
+# Compartida por get_system_info, get_network_info y get_ram_info: la misma WQL se resuelve una vez por reporte
+COMPUTER_SYSTEM_QUERY = WQLQuery("Win32_ComputerSystem", ["Manufacturer", "Model", "Domain", "Workgroup", "PartOfDomain", "TotalPhysicalMemory"])
+
 def get_system_info(c):
     try:
-        system = c.Win32_ComputerSystem()[0]
+        system = records(c, COMPUTER_SYSTEM_QUERY)[0]
         return {"Fabricante": system.Manufacturer, "Modelo": system.Model}
-    except Exception as e: return {"Error": f"No se pudo obtener la info del sistema: {e}"}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info del sistema: {e}"}
+
+BIOS_QUERY = WQLQuery("Win32_BIOS", ["Manufacturer", "Version", "SerialNumber"])
 
 def get_bios_info(c):
     try:
-        bios = c.Win32_BIOS()[0]
+        bios = records(c, BIOS_QUERY)[0]
         return {"Fabricante BIOS": bios.Manufacturer, "Versión BIOS": bios.Version, "Número de Serie PC": bios.SerialNumber}
-    except Exception as e: return {"Error": f"No se pudo obtener la info de la BIOS: {e}"}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info de la BIOS: {e}"}
+
+OS_QUERY = WQLQuery("Win32_OperatingSystem", ["Caption", "Version", "OSArchitecture"])
 
-def get_os_info(c):
+def get_os_info(c, local=True):
+    # platform.release() describe el equipo que ejecuta el programa: con una conexión remota (local=False) solo vale WMI
     try:
-        os_info = c.Win32_OperatingSystem()[0]
-        return {"Sistema Operativo": os_info.Caption, "Versión": f"{platform.release()} ({os_info.Version})", "Arquitectura": os_info.OSArchitecture}
-    except Exception as e: return {"Error": f"No se pudo obtener la info del SO: {e}"}
+        os_info = records(c, OS_QUERY)[0]
+        version = f"{platform.release()} ({os_info.Version})" if local else os_info.Version
+        return {"Sistema Operativo": os_info.Caption, "Versión": version, "Arquitectura": os_info.OSArchitecture}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info del SO: {e}"}
+
+NETWORK_ADAPTER_QUERY = WQLQuery("Win32_NetworkAdapterConfiguration", ["Description", "IPAddress"], "IPEnabled = TRUE")
 
 def get_network_info(c):
     hostname = socket.gethostname()
     ipv4_ethernet, ipv4_wifi = "No disponible o desconectado", "No disponible o desconectado"
     try:
-        for adapter in c.Win32_NetworkAdapterConfiguration(IPEnabled=True):
+        for adapter in records(c, NETWORK_ADAPTER_QUERY):
             desc = adapter.Description.lower()
             if adapter.IPAddress:
                 ip = adapter.IPAddress[0]
                 if 'ethernet' in desc or 'gigabit' in desc: ipv4_ethernet = ip
                 elif 'wi-fi' in desc or 'wireless' in desc: ipv4_wifi = ip
-    except Exception: pass
+    except Exception as e: instrumentation.record_exception(e)
     try:
-        system = c.Win32_ComputerSystem()[0]
+        system = records(c, COMPUTER_SYSTEM_QUERY)[0]
         return {"Hostname": hostname, "Usuario Actual": os.getlogin(), "Dominio/Grupo": system.Domain if system.PartOfDomain else system.Workgroup, "Dirección IPv4 (Ethernet)": ipv4_ethernet, "Dirección IPv4 (Wi-Fi)": ipv4_wifi}
-    except Exception as e: return {"Error": f"No se pudo obtener la info de red: {e}"}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info de red: {e}"}
+
+PHYSICAL_MEMORY_QUERY = WQLQuery("Win32_PhysicalMemory", ["Speed"])
 
 def get_ram_info(c):
     try:
-        cs = c.Win32_ComputerSystem()[0]
+        cs = records(c, COMPUTER_SYSTEM_QUERY)[0]
         total_ram_gb = round(int(cs.TotalPhysicalMemory) / (1024**3), 2)
         mem_speed = "No disponible"
-        physical_memory = c.Win32_PhysicalMemory()
+        physical_memory = records(c, PHYSICAL_MEMORY_QUERY)
         if physical_memory: mem_speed = f"{physical_memory[0].Speed} MHz"
         return {"RAM Total": f"{total_ram_gb} GB", "Velocidad": mem_speed}
-    except Exception as e: return {"Error": f"No se pudo obtener la info de la RAM: {e}"}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info de la RAM: {e}"}
+
+STORAGE_DISK_QUERY = WQLQuery("MSFT_PhysicalDisk", ["Manufacturer", "Size", "SerialNumber"])
+DISK_DRIVE_QUERY = WQLQuery("Win32_DiskDrive", ["Model", "Size", "SerialNumber"])
+DISK_COLUMNS = ("Fabricante", "Capacidad Total", "Número de Serie")
 
-def get_disk_info():
-    disks = []
+def get_disk_info(connect=None):
+    # connect(namespace=...) abre una conexión WMI; por defecto wmi.WMI
+    if connect is None:
+        import wmi
+        connect = wmi.WMI
+    disks = Table(DISK_COLUMNS)
     try:
-        c_storage = wmi.WMI(namespace="ROOT\Microsoft\Windows\Storage")
-        physical_disks = c_storage.MSFT_PhysicalDisk()
+        c_storage = connect(namespace="ROOT\Microsoft\Windows\Storage")
+        physical_disks = records(c_storage, STORAGE_DISK_QUERY)
         for disk in physical_disks:
-            disks.append({"Fabricante": disk.Manufacturer, "Capacidad Total": f"{round(int(disk.Size) / (1024**3), 2)} GB", "Número de Serie": disk.SerialNumber.strip()})
+            disks.append((disk.Manufacturer, f"{round(int(disk.Size) / (1024**3), 2)} GB", disk.SerialNumber.strip()))
         return disks
-    except Exception:
+    except Exception as e:
+        instrumentation.record_exception(e)
         try:
-            c_disk = wmi.WMI()
-            for disk in c_disk.Win32_DiskDrive():
-                disks.append({"Fabricante": disk.Model, "Capacidad Total": f"{round(int(disk.Size) / (1024**3), 2)} GB", "Número de Serie": disk.SerialNumber.strip() if disk.SerialNumber else "No disponible"})
+            c_disk = connect()
+            for disk in records(c_disk, DISK_DRIVE_QUERY):
+                disks.append((disk.Model, f"{round(int(disk.Size) / (1024**3), 2)} GB", disk.SerialNumber.strip() if disk.SerialNumber else "No disponible"))
             return disks
         except Exception as e_fallback:
+             instrumentation.record_exception(e_fallback)
              return [{"Error": f"No se pudo obtener la info de los discos: {e_fallback}"}]
 
+PROCESSOR_QUERY = WQLQuery("Win32_Processor", ["Name", "Manufacturer", "NumberOfCores", "NumberOfLogicalProcessors", "MaxClockSpeed"])
+
 def get_cpu_info(c):
     try:
-        processor = c.Win32_Processor()[0]
+        processor = records(c, PROCESSOR_QUERY)[0]
         name = processor.Name.strip()
         manufacturer = processor.Manufacturer
         generation = "No detectada"
@@ -82,21 +125,33 @@ def get_cpu_info(c):
             match = re.search(r'Ryzen\s+\d\s+(\d)\d{3}', name)
             if match: generation = f"Serie Ryzen {match.group(1)}000"
         return {"Procesador": name, "Generación / Serie": generation, "Fabricante": manufacturer, "Núcleos Físicos": processor.NumberOfCores, "Procesadores Lógicos": processor.NumberOfLogicalProcessors, "Velocidad Máxima": f"{processor.MaxClockSpeed} MHz"}
-    except Exception as e: return {"Error": f"No se pudo obtener la info del procesador: {e}"}
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return {"Error": f"No se pudo obtener la info del procesador: {e}"}
 
-def get_installed_software(c):
-    software_list = []
+PRODUCT_QUERY = WQLQuery("Win32_Product", ["Name", "Version", "Vendor"])
+
+def get_installed_software(c, source=None, reader=None):
+    # "registry" (por defecto) lee las claves Uninstall; "wmi" enumera Win32_Product (lento)
+    source = source or SOFTWARE_SOURCE
     try:
-    
-        for product in c.Win32_Product():
-            software_list.append({"Nombre": product.Name, "Versión": product.Version, "Vendedor": product.Vendor})
-        return sorted(software_list, key=lambda x: x['Nombre'])
-    except Exception as e: return [{"Error": f"No se pudo obtener la lista de programas: {e}"}]
+        if source == "registry":
+            return software_inventory.read_installed_software(reader or software_inventory.WinregReader())
+        software_list = [(product.Name, product.Version, product.Vendor) for product in records(c, PRODUCT_QUERY)]
+        return Table(software_inventory.SOFTWARE_COLUMNS, sorted(software_list, key=lambda x: x[0]))
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return [{"Error": f"No se pudo obtener la lista de programas: {e}"}]
+
+PRINTER_QUERY = WQLQuery("Win32_Printer", ["Name", "DriverName", "PortName", "Default"])
+PRINTER_COLUMNS = ("Nombre", "Controlador", "Puerto", "Default")
 
 def get_installed_printers(c):
-    printers = []
+    printers = Table(PRINTER_COLUMNS)
     try:
-        for printer in c.Win32_Printer():
-            printers.append({"Nombre": printer.Name, "Controlador": printer.DriverName, "Puerto": printer.PortName, "Default": "Sí" if printer.Default else "No"})
+        for printer in records(c, PRINTER_QUERY):
+            printers.append((printer.Name, printer.DriverName, printer.PortName, "Sí" if printer.Default else "No"))
         return printers
-    except Exception as e: return [{"Error": f"No se pudo obtener la lista de impresoras: {e}"}]
\ No newline at end of file
+    except Exception as e:
+        instrumentation.record_exception(e)
+        return [{"Error": f"No se pudo obtener la lista de impresoras: {e}"}]
\ No newline at end of file
@@ -0,0 +1,102 @@
+# InfoSystem_cli.py
+
+# Punto de entrada sin interfaz gráfica, pensado para scripts de despliegue y
+# tareas programadas. Solo se importan los módulos pesados que se necesitan:
+# wmi al abrir la primera conexión, reportlab con PDF y openpyxl con Excel.
+
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import urllib.error
+
+import collector
+import instrumentation
+import report_generator as reporter
+import snapshot
+import wmi_cache
+
+FORMAT_NAMES = {"html": "HTML", "pdf": "PDF", "excel": "Excel"}
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Genera reportes de información del sistema sin interfaz gráfica.")
+    parser.add_argument("-s", "--sections", nargs="+", choices=list(collector.COLLECTORS), default=list(collector.COLLECTORS), metavar="SECCION",
+                        help=f"secciones a incluir: {', '.join(collector.COLLECTORS)} (todas por defecto)")
+    parser.add_argument("-f", "--formats", nargs="+", choices=list(FORMAT_NAMES), default=["html"], metavar="FORMATO",
+                        help="formatos de salida: html, pdf, excel (html por defecto)")
+    parser.add_argument("-o", "--output-dir", default=".", help="carpeta donde se escriben los reportes")
+    parser.add_argument("--software-source", choices=["registry", "wmi"], default="registry",
+                        help="origen del inventario de programas; wmi usa Win32_Product (lento)")
+    parser.add_argument("--serial", action="store_true", help="genera los formatos uno tras otro en lugar de en procesos paralelos")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reutiliza las secciones estables (BIOS, CPU, RAM, discos...) de la instantánea anterior si siguen frescas")
+    parser.add_argument("--delta", action="store_true", help="genera además un reporte HTML con los cambios desde la instantánea anterior")
+    parser.add_argument("--snapshot-dir", default=snapshot.SNAPSHOT_DIR, help="carpeta de las instantáneas")
+    parser.add_argument("--trace", action="store_true", help="escribe una traza de rendimiento JSON junto al reporte")
+    parser.add_argument("--trace-footer", action="store_true", help="muestra el resumen de la traza en el pie de los reportes")
+    parser.add_argument("--timeout", type=float, help="segundos máximos por sección; las que no responden quedan marcadas como incompletas "
+                        f"(por defecto {collector.DEFAULT_TIMEOUT} s, programas {collector.TIMEOUTS['software']} s)")
+    parser.add_argument("--agent", nargs="?", const="http://127.0.0.1:8765", metavar="URL",
+                        help="toma los datos de un agente en ejecución (agent.py) en lugar de recolectarlos")
+    parser.add_argument("--max-age", type=float, default=snapshot.MAX_AGE / 3600, help="horas que una sección estable se considera fresca")
+    return parser
+
+def main(argv=None, connection_factory=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.agent and (args.incremental or args.delta):
+        parser.error("--agent no se puede combinar con --incremental ni --delta (el agente mantiene sus propias instantáneas)")
+    trace = instrumentation.Trace()
+    timeouts = {key: args.timeout for key in args.sections} if args.timeout else None
+
+    if args.agent:
+        # El agente ya tiene los datos en memoria: el reporte solo cuesta la generación
+        import agent
+        try:
+            all_data = agent.fetch_data(args.agent, args.sections)
+        except urllib.error.HTTPError as e:
+            # El agente responde {"Error": ...}, p. ej. si no mantiene alguna de las secciones pedidas
+            try:
+                detail = json.loads(e.read().decode("utf-8"))["Error"]
+            except (ValueError, KeyError, TypeError):
+                detail = e.reason
+            print(f"Error del agente en {args.agent} (HTTP {e.code}): {detail}", file=sys.stderr)
+            return 1
+        except OSError as e: # URLError (agente caído, conexión rechazada) o un timeout al leer la respuesta
+            print(f"No se pudo contactar al agente en {args.agent}: {getattr(e, 'reason', e)}", file=sys.stderr)
+            return 1
+    elif args.incremental or args.delta:
+        # Sin --incremental se recolecta todo (max_age=0), pero igualmente se guarda la instantánea
+        max_age = args.max_age * 3600 if args.incremental else 0
+        all_data, previous, _ = snapshot.incremental_collect(args.sections, snapshot_dir=args.snapshot_dir, max_age=max_age,
+                                                             connection_factory=connection_factory, cache=wmi_cache.QueryCache(), trace=trace,
+                                                             timeouts=timeouts, software_source=args.software_source)
+    else:
+        all_data = collector.collect(args.sections, connection_factory, cache=wmi_cache.QueryCache(), trace=trace, timeouts=timeouts,
+                                     software_source=args.software_source)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    base_filename = os.path.join(args.output_dir, reporter.default_base_filename())
+    formats = [FORMAT_NAMES[fmt] for fmt in args.formats]
+    footer = trace.footer_lines() if args.trace_footer else None
+    generated_files, errors = reporter.generate_reports(all_data, base_filename, formats, parallel=not args.serial, trace=trace, footer=footer)
+    if args.trace:
+        trace.save(f"{base_filename}_traza.json")
+        generated_files.append(f"{base_filename}_traza.json")
+    if args.delta and not previous:
+        # Sin instantánea anterior no hay con qué comparar: esta ejecución solo la crea
+        print(f"Sin instantánea anterior en {args.snapshot_dir}: no se genera el reporte de cambios", file=sys.stderr)
+    elif args.delta:
+        reporter.generate_delta_html(snapshot.diff(previous, all_data), f"{base_filename}_cambios.html", socket.gethostname())
+        generated_files.append(f"{base_filename}_cambios.html")
+
+    for filename in generated_files: print(filename)
+    for fmt, error in errors.items(): print(f"Error generando {fmt}: {error}", file=sys.stderr)
+    for key in collector.incomplete_sections(all_data): print(f"Sección incompleta: {key}", file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,253 @@
+# agent.py
+
+# Modo agente: un proceso residente que mantiene en memoria el último
+# `all_data` del equipo y refresca cada sección con su propia frecuencia (el
+# hardware casi nunca, la red, las impresoras y los programas más a menudo).
+# Sirve reportes y JSON al instante por HTTP local, de modo que un reporte solo
+# cuesta el tiempo de generación.
+#
+#   GET  /status                      secciones, cuándo se recolectaron y cuándo toca refrescarlas
+#   GET  /data[?sections=cpu,ram]     all_data en JSON (las listas como {"columns", "rows"})
+#   GET  /report.html|.pdf|.xlsx      reporte generado a partir de los datos en memoria
+#   POST /refresh[?sections=...]      refresca ya las secciones indicadas (todas por defecto)
+
+import argparse
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import collector
+import report_generator as reporter
+import snapshot
+import tabular
+import wmi_cache
+
+HOST = "127.0.0.1" # Solo se escucha en local
+PORT = 8765
+FIRST_COLLECTION_WAIT = 300 # Segundos que una petición espera a la primera recolección
+
+# Segundos entre refrescos de cada sección
+REFRESH_INTERVALS = {
+    **{key: 24 * 3600 for key in snapshot.STABLE_SECTIONS},
+    "network": 5 * 60,
+    "printers": 5 * 60,
+    "software": 15 * 60,
+}
+RETRY_INTERVAL = 60 # Tras un error, la sección se vuelve a intentar antes que en su intervalo normal
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".pdf": "application/pdf",
+    ".xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+class Agent:
+    """Datos del equipo en memoria con refresco escalonado por sección.
+
+    El planificador (`start`) duerme hasta la próxima sección vencida y
+    recolecta juntas todas las que vencen a la vez, con una sola QueryCache. Una
+    sección que vuelve con error no reemplaza a los datos válidos anteriores y se
+    reintenta tras RETRY_INTERVAL. `connection_factory`, `collectors` y `clock`
+    permiten sustituir WMI, los colectores y el reloj (p. ej. en Linux);
+    `software_source` se pasa a collector.collect. Con `snapshot_dir` arranca
+    desde la última instantánea y la actualiza en cada refresco.
+    """
+    def __init__(self, sections=tuple(collector.COLLECTORS), intervals=None, connection_factory=None, collectors=None,
+                 timeouts=None, snapshot_dir=None, software_source=None, clock=time.time):
+        self.sections = list(sections)
+        self.intervals = {**REFRESH_INTERVALS, **(intervals or {})}
+        self.connection_factory = connection_factory
+        self.collectors = collectors
+        self.timeouts = timeouts
+        self.software_source = software_source
+        self.snapshot_dir = snapshot_dir
+        self.clock = clock
+        self.hostname = socket.gethostname()
+        self.data = {}
+        self.collected = {} # sección -> momento de los datos actuales
+        self.next_refresh = {key: 0 for key in self.sections}
+        self.ready = threading.Event() # Hay datos de todas las secciones
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        if snapshot_dir: self._seed(snapshot.load(self.hostname, snapshot_dir))
+
+    def _seed(self, sections):
+        for key, entry in sections.items():
+            if key not in self.next_refresh or collector.has_error(entry["data"]): continue
+            self.data[key], self.collected[key] = entry["data"], entry["collected"]
+            self.next_refresh[key] = entry["collected"] + self.intervals.get(key, RETRY_INTERVAL)
+        if len(self.data) == len(self.sections): self.ready.set()
+
+    def due(self):
+        """Secciones cuyo refresco ya venció."""
+        now = self.clock()
+        return [key for key in self.sections if self.next_refresh[key] <= now]
+
+    def refresh(self, keys=None):
+        """Recolecta `keys` (todas por defecto) y actualiza los datos en memoria; devuelve lo recolectado."""
+        keys = list(keys or self.sections)
+        with self._refresh_lock:
+            collected = collector.collect(keys, self.connection_factory, cache=wmi_cache.QueryCache(), collectors=self.collectors,
+                                          timeouts=self.timeouts, software_source=self.software_source)
+            now = self.clock()
+            with self._lock:
+                for key, section_data in collected.items():
+                    failed = collector.has_error(section_data)
+                    if not failed or key not in self.data:
+                        self.data[key] = section_data
+                        self.collected[key] = now
+                    self.next_refresh[key] = now + (RETRY_INTERVAL if failed else self.intervals.get(key, RETRY_INTERVAL))
+                if all(key in self.data for key in self.sections): self.ready.set()
+                sections = {key: {"collected": self.collected[key], "data": self.data[key]} for key in self.data}
+            if self.snapshot_dir: snapshot.save(self.hostname, sections, self.snapshot_dir)
+        return collected
+
+    def run_pending(self):
+        """Un paso del planificador: refresca las secciones vencidas. Devuelve las que refrescó."""
+        keys = self.due()
+        if keys: self.refresh(keys)
+        return keys
+
+    def snapshot(self, keys=None):
+        """Copia de `all_data` con `keys` (todas por defecto), en el orden de las secciones.
+
+        Las secciones se reemplazan enteras al refrescar, así que la copia se puede
+        generar sin bloquear al planificador.
+        """
+        with self._lock:
+            return {key: self.data[key] for key in (keys or self.sections) if key in self.data}
+
+    def status(self):
+        with self._lock:
+            return {"host": self.hostname, "sections": {key: {"collected": self.collected.get(key), "next_refresh": self.next_refresh[key],
+                                                              "error": key in self.data and collector.has_error(self.data[key])}
+                                                        for key in self.sections}}
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_pending()
+            except Exception as e:
+                print(f"Error en el refresco: {e}", file=sys.stderr)
+            with self._lock: wait = min(self.next_refresh.values()) - self.clock()
+            self._wake.wait(max(0, wait))
+            self._wake.clear()
+
+    def start(self):
+        """Arranca el planificador en un hilo daemon."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="agent-scheduler")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread: self._thread.join()
+
+def render(data, extension):
+    """Genera el reporte de `data` en el formato de `extension` y devuelve sus bytes."""
+    if extension == ".html":
+        out = io.StringIO()
+        reporter.render_html(data, out)
+        return out.getvalue().encode("utf-8")
+    fmt = next(fmt for fmt, (ext, _) in reporter.FORMATS.items() if ext == extension)
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, f"reporte{extension}")
+        reporter.FORMATS[fmt][1](data, filename)
+        with open(filename, "rb") as f:
+            return f.read()
+
+class AgentHandler(BaseHTTPRequestHandler):
+    def _sections(self, query):
+        requested = [key for value in query.get("sections", []) for key in value.split(",") if key]
+        unknown = set(requested) - set(self.server.agent.sections)
+        if unknown: raise ValueError(f"sección desconocida: {', '.join(sorted(unknown))}")
+        return requested or None
+
+    def _send(self, status, body, content_type="application/json; charset=utf-8"):
+        if not isinstance(body, bytes): body = json.dumps(body, ensure_ascii=False, default=tabular.encode).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        agent = self.server.agent
+        url = urllib.parse.urlparse(self.path)
+        try:
+            keys = self._sections(urllib.parse.parse_qs(url.query))
+        except ValueError as e:
+            return self._send(400, {"Error": str(e)})
+        if url.path == "/status": return self._send(200, agent.status())
+
+        extension = os.path.splitext(url.path)[1]
+        if url.path != "/data" and not (url.path.startswith("/report") and extension in CONTENT_TYPES):
+            return self._send(404, {"Error": f"ruta desconocida: {url.path}"})
+        if not agent.ready.wait(FIRST_COLLECTION_WAIT):
+            return self._send(503, {"Error": "la primera recolección aún no terminó"})
+        data = agent.snapshot(keys)
+        if url.path == "/data": return self._send(200, data)
+        try:
+            self._send(200, render(data, extension), CONTENT_TYPES[extension])
+        except Exception as e:
+            self._send(500, {"Error": f"No se pudo generar el reporte: {e}"})
+
+    def do_POST(self):
+        url = urllib.parse.urlparse(self.path)
+        if url.path != "/refresh": return self._send(404, {"Error": f"ruta desconocida: {url.path}"})
+        try:
+            keys = self._sections(urllib.parse.parse_qs(url.query))
+        except ValueError as e:
+            return self._send(400, {"Error": str(e)})
+        self.server.agent.refresh(keys)
+        self._send(200, self.server.agent.status())
+
+    def log_message(self, format, *args):
+        if self.server.verbose: super().log_message(format, *args)
+
+class AgentServer(ThreadingHTTPServer):
+    """Servidor HTTP del agente; con port=0 el sistema elige un puerto libre (ver `server_address`)."""
+    daemon_threads = True
+
+    def __init__(self, agent, host=HOST, port=PORT, verbose=False):
+        self.agent = agent
+        self.verbose = verbose
+        super().__init__((host, port), AgentHandler)
+
+def fetch_data(url=f"http://{HOST}:{PORT}", sections=None, timeout=FIRST_COLLECTION_WAIT):
+    """Pide `all_data` a un agente en ejecución (las listas vuelven como tabular.Table)."""
+    query = f"?sections={','.join(sections)}" if sections else ""
+    with urllib.request.urlopen(f"{url.rstrip('/')}/data{query}", timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"), object_hook=tabular.decode)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Agente residente: mantiene los datos del equipo en memoria y sirve reportes por HTTP local.")
+    parser.add_argument("-s", "--sections", nargs="+", choices=list(collector.COLLECTORS), default=list(collector.COLLECTORS), metavar="SECCION")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--software-source", choices=["registry", "wmi"], default="registry")
+    parser.add_argument("--snapshot-dir", default=snapshot.SNAPSHOT_DIR, help="carpeta de las instantáneas con las que arranca el agente")
+    parser.add_argument("-v", "--verbose", action="store_true", help="muestra cada petición HTTP")
+    args = parser.parse_args()
+
+    agent = Agent(args.sections, snapshot_dir=args.snapshot_dir, software_source=args.software_source)
+    agent.start()
+    server = AgentServer(agent, port=args.port, verbose=args.verbose)
+    print(f"Agente escuchando en http://{HOST}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        agent.stop()
@@ -0,0 +1,492 @@
+# benchmark.py
+
+import argparse
+import collections
+import json
+import os
+import pickle
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import urllib.request
+
+import InfoSystem_backend as backend
+import agent
+import collector
+import fleet
+import report_generator
+import snapshot
+import tabular
+import wmi_cache
+import wmi_pool
+import wmi_simulator
+
+# El simulador no tiene registro: el inventario de software pasa por Win32_Product
+SIMULATED_COLLECTORS = collector.software_collectors("wmi")
+
+def bench_collect(latency=0.2, software_latency=1.0):
+    """Compara la recolección en serie con el motor concurrente sobre WMI simulado."""
+    factory = wmi_simulator.connection_factory(latency=latency, class_latency={"Win32_Product": software_latency})
+    keys = list(collector.COLLECTORS)
+
+    start = time.perf_counter()
+    for key in keys: collector.run_collector(key, factory, SIMULATED_COLLECTORS)
+    serial = time.perf_counter() - start
+
+    start = time.perf_counter()
+    collector.collect(keys, factory, max_workers=len(keys), collectors=SIMULATED_COLLECTORS)
+    concurrent = time.perf_counter() - start
+
+    print(f"Recolección en serie:     {serial:.2f} s")
+    print(f"Recolección concurrente:  {concurrent:.2f} s (colector más lento: {software_latency:.2f} s)")
+
+def bench_cache(latency=0.05):
+    """Cuenta las consultas WMI por clase de un reporte completo con la caché de consultas."""
+    traffic = wmi_simulator.Traffic()
+    cache = wmi_cache.QueryCache()
+    factory = wmi_simulator.connection_factory(traffic=traffic, latency=latency)
+    collector.collect(list(collector.COLLECTORS), factory, cache=cache, collectors=SIMULATED_COLLECTORS)
+    for wmi_class, count in sorted(traffic.queries.items()):
+        print(f"{wmi_class:<36} {count} consulta(s)")
+    print(f"Caché: {cache.hits} aciertos, {cache.misses} fallos")
+
+# Acceso de los colectores anteriores a WQLQuery: c.Win32_X() (SELECT *) y las mismas
+# lecturas de propiedades sobre el objeto WMI
+def _legacy_network(c):
+    for adapter in c.Win32_NetworkAdapterConfiguration(IPEnabled=True):
+        adapter.Description.lower()
+        if adapter.IPAddress: adapter.IPAddress[0]
+    system = c.Win32_ComputerSystem()[0]
+    return system.Domain if system.PartOfDomain else system.Workgroup
+
+def _legacy_ram(c):
+    int(c.Win32_ComputerSystem()[0].TotalPhysicalMemory)
+    physical_memory = c.Win32_PhysicalMemory()
+    if physical_memory: physical_memory[0].Speed
+
+def _legacy_cpu(c):
+    processor = c.Win32_Processor()[0]
+    return processor.Name.strip(), processor.Manufacturer, processor.NumberOfCores, processor.NumberOfLogicalProcessors, processor.MaxClockSpeed
+
+LEGACY_ACCESS = {
+    "system": lambda c: [(system.Manufacturer, system.Model) for system in c.Win32_ComputerSystem()[:1]],
+    "network": _legacy_network,
+    "bios": lambda c: [(bios.Manufacturer, bios.Version, bios.SerialNumber) for bios in c.Win32_BIOS()[:1]],
+    "cpu": _legacy_cpu,
+    "ram": _legacy_ram,
+    "disks": lambda connect: [(disk.Manufacturer, int(disk.Size), disk.SerialNumber.strip())
+                              for disk in connect(wmi_simulator.STORAGE_NAMESPACE).MSFT_PhysicalDisk()],
+    "os": lambda c: [(os_info.Caption, os_info.Version, os_info.OSArchitecture) for os_info in c.Win32_OperatingSystem()[:1]],
+    "printers": lambda c: [(printer.Name, printer.DriverName, printer.PortName, printer.Default) for printer in c.Win32_Printer()],
+    "software": lambda c: [(product.Name, product.Version, product.Vendor) for product in c.Win32_Product()],
+}
+
+def bench_projection(software=1000, printers=30, disks=8):
+    """Propiedades transferidas y leídas por sección: WQL proyectada frente al acceso por clase (SELECT *)."""
+    counts = {"software": software, "printers": printers, "disks": disks}
+    totals = collections.Counter()
+    for key in collector.COLLECTORS:
+        measured = {}
+        for name, collectors in (("wql", SIMULATED_COLLECTORS), ("clase", LEGACY_ACCESS)):
+            traffic = wmi_simulator.Traffic()
+            collector.run_collector(key, wmi_simulator.connection_factory(traffic=traffic, **counts), collectors)
+            measured[name] = (sum(traffic.properties.values()), sum(traffic.fetches.values()))
+            totals[name, "transferidas"] += measured[name][0]
+            totals[name, "leídas"] += measured[name][1]
+        print(f"{key:<10}: {measured['wql'][0]:7} transferidas, {measured['wql'][1]:5} leídas "
+              f"(acceso por clase: {measured['clase'][0]:7}, {measured['clase'][1]:5})")
+    print(f"Total     : {totals['wql', 'transferidas']:7} transferidas, {totals['wql', 'leídas']:5} leídas "
+          f"(acceso por clase: {totals['clase', 'transferidas']:7}, {totals['clase', 'leídas']:5}; "
+          f"{totals['clase', 'transferidas'] / totals['wql', 'transferidas']:.1f}x menos propiedades transferidas)")
+
+def bench_pool(reports=3):
+    """Cuenta las conexiones WMI abiertas por namespace en varios reportes completos con el pool."""
+    opened = collections.Counter()
+    pool = wmi_pool.ConnectionPool(wmi_simulator.pool_factory(opened, latency=0.01))
+    for _ in range(reports):
+        collector.collect(list(collector.COLLECTORS), pool.factory_for(), max_workers=len(collector.COLLECTORS), collectors=SIMULATED_COLLECTORS)
+    for namespace, count in opened.items():
+        namespace = namespace or "(por defecto)"
+        print(f"{namespace:<36} {count} conexión(es) en {reports} reportes")
+
+def bench_software(entries=5000, product_latency=0.0002):
+    """Compara el inventario por registro con Win32_Product sobre `entries` programas sintéticos."""
+    reader = wmi_simulator.registry(entries)
+    start = time.perf_counter()
+    registry = backend.get_installed_software(None, source="registry", reader=reader)
+    registry_time = time.perf_counter() - start
+
+    # Win32_Product cuesta aproximadamente un tiempo fijo por paquete MSI verificado
+    c = wmi_simulator.SimulatedWMI(software=entries, class_latency={"Win32_Product": entries * product_latency})
+    start = time.perf_counter()
+    products = backend.get_installed_software(c, source="wmi")
+    wmi_time = time.perf_counter() - start
+
+    print(f"Registro:       {registry_time * 1000:8.1f} ms ({len(registry)} programas)")
+    print(f"Win32_Product:  {wmi_time * 1000:8.1f} ms ({len(products)} programas, {product_latency * 1000:.1f} ms simulados por paquete)")
+
+def synthetic_data(software=1000, printers=20, disks=4):
+    """Datos de reporte completos recolectados del WMI simulado."""
+    factory = wmi_simulator.connection_factory(software=software, printers=printers, disks=disks)
+    return collector.collect(list(collector.COLLECTORS), factory, collectors=SIMULATED_COLLECTORS)
+
+def timed(function, *args):
+    """Segundos de una ejecución de `function(*args)` sin tracemalloc activo."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def peak_memory(function, *args):
+    """Pico de memoria en MiB de una ejecución de `function(*args)` medido con tracemalloc (que la hace mucho más lenta)."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] / 1024**2
+    finally:
+        tracemalloc.stop()
+
+def measure(function, *args):
+    """Devuelve (segundos, pico de memoria en MiB): el tiempo de una ejecución normal y el pico de otra con tracemalloc."""
+    return timed(function, *args), peak_memory(function, *args)
+
+def bench_html(sizes=(100, 1000, 10000, 100000)):
+    """Tiempo y memoria de generate_html según el número de programas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            data = synthetic_data(software=rows)
+            elapsed, peak = measure(report_generator.generate_html, data, os.path.join(tmp, "reporte.html"))
+            print(f"{rows:>7} filas: {elapsed * 1000:9.1f} ms  {elapsed / rows * 1e6:6.2f} µs/fila  pico {peak:6.2f} MiB")
+
+def bench_excel(sizes=(10000, 100000)):
+    """Tiempo y memoria de generate_excel en modo write-only frente al libro normal.
+
+    Los tiempos de ambos modos se toman primero sin tracemalloc; los picos de memoria salen de ejecuciones aparte.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "reporte.xlsx")
+        for rows in sizes:
+            data = synthetic_data(software=rows)
+            times = {write_only: timed(report_generator.generate_excel, data, filename, write_only) for write_only in (False, True)}
+            for write_only, elapsed in times.items():
+                peak = peak_memory(report_generator.generate_excel, data, filename, write_only)
+                mode = "write-only" if write_only else "normal"
+                print(f"{rows:>7} filas {mode:<10}: {elapsed:7.2f} s  {elapsed / rows * 1e6:6.1f} µs/fila  pico {peak:8.2f} MiB")
+
+def bench_pdf(sizes=(1000, 5000, 10000, 20000)):
+    """Tiempo de generate_pdf con una sola tabla por lista frente al modo de listas grandes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            data = synthetic_data(software=rows)
+            for large_list_rows in (None, 0):
+                start = time.perf_counter()
+                report_generator.generate_pdf(data, os.path.join(tmp, "reporte.pdf"), large_list_rows)
+                elapsed = time.perf_counter() - start
+                mode = "una tabla" if large_list_rows is None else "por páginas"
+                print(f"{rows:>6} filas {mode:<11}: {elapsed:7.2f} s  {elapsed / rows * 1000:6.3f} ms/fila")
+
+def bench_records(rows=100000):
+    """Memoria y tiempo de render de una lista de programas como tabular.Table frente a una lista de diccionarios."""
+    base = synthetic_data(software=rows)
+    build = {
+        "Table": lambda: tabular.Table(base["software"].columns, (tuple([*row]) for row in base["software"])),
+        "dicts": lambda: [dict(zip(base["software"].columns, row)) for row in base["software"]],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, make in build.items():
+            tracemalloc.start()
+            software = make()
+            size = tracemalloc.get_traced_memory()[0] / 1024**2
+            tracemalloc.stop()
+            data = dict(base, software=software)
+            payload = len(pickle.dumps(data, pickle.HIGHEST_PROTOCOL)) / 1024**2
+            times = []
+            for generate, extension in ((report_generator.generate_html, ".html"), (report_generator.generate_excel, ".xlsx")):
+                start = time.perf_counter()
+                generate(data, os.path.join(tmp, f"reporte{extension}"))
+                times.append(time.perf_counter() - start)
+            html, excel = times
+            print(f"{label:<6}: {size:6.1f} MiB en memoria, {payload:5.1f} MiB serializado, HTML {html:5.2f} s, Excel {excel:5.2f} s ({rows} filas)")
+
+def bench_render(software=10000):
+    """Genera HTML, PDF y Excel en serie y en procesos paralelos sobre los mismos datos."""
+    data = synthetic_data(software=software)
+    formats = list(report_generator.FORMATS)
+    with tempfile.TemporaryDirectory() as tmp:
+        for parallel in (False, True):
+            start = time.perf_counter()
+            files, errors = report_generator.generate_reports(data, os.path.join(tmp, "reporte"), formats, parallel)
+            elapsed = time.perf_counter() - start
+            assert not errors, errors
+            print(f"{'En paralelo' if parallel else 'En serie':<12}: {elapsed:6.2f} s ({len(files)} formatos, {software} programas)")
+
+def bench_fleet(hosts=1000, latency=0.005, max_hosts=64):
+    """Prueba de carga del modo flota con equipos simulados, incluidos equipos caídos, colgados e inestables."""
+    names = [f"PC-{i:04d}" for i in range(hosts)]
+    factory = wmi_simulator.host_factory(unreachable=names[:5], hanging=names[5:7], flaky=names[7:17], hang_time=5, latency=latency)
+    registry = wmi_simulator.registry(200)
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        summary, results = fleet.run_fleet(names, output_dir=tmp, host_factory=factory, registry_factory=lambda host: registry,
+                                           max_hosts=max_hosts, timeout=1, retries=1)
+        elapsed = time.perf_counter() - start
+    retried = sum(1 for result in results.values() if result.get("attempts", 1) > 1)
+    print(f"{hosts} equipos en {elapsed:.2f} s ({hosts / elapsed:.0f} equipos/s, {max_hosts} a la vez)")
+    print(f"Correctos: {summary['Correctos']}, con error: {len(summary['Equipos con error'])}, recuperados tras reintento: {retried}")
+    print(f"RAM Total: {summary['RAM Total']}  Generación de CPU: {summary['Generación de CPU']}")
+    assert summary["Correctos"] == hosts - 7 and retried == 10
+
+def bench_snapshot(latency=0.3, software=5000):
+    """Recolección completa frente a incremental en un equipo sin cambios, y diff de listas de software grandes."""
+    keys = [key for key in collector.COLLECTORS if key != "software"]
+    factory = wmi_simulator.connection_factory(latency=latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("Completa (sin instantánea)", "Incremental"):
+            start = time.perf_counter()
+            _, _, reused = snapshot.incremental_collect(keys, "PC-0001", tmp, max_workers=1, connection_factory=factory)
+            print(f"{label:<27}: {time.perf_counter() - start:6.2f} s, reutilizadas: {', '.join(reused) or 'ninguna'}")
+
+    old = synthetic_data(software=software)
+    new = synthetic_data(software=software)
+    rows = new["software"].rows[100:]
+    rows[:200] = [(name, f"{version}.1", vendor) for name, version, vendor in rows[:200]]
+    new["software"] = tabular.Table(new["software"].columns, rows + [(f"Nuevo {i}", "1.0", "Proveedor") for i in range(50)])
+    start = time.perf_counter()
+    delta = snapshot.diff(old, new)
+    elapsed = time.perf_counter() - start
+    counts = {kind: len(rows) for kind, rows in delta["software"].items()}
+    print(f"Diff de {software} programas: {elapsed * 1000:.1f} ms {counts}")
+    assert counts == {"added": 50, "removed": 100, "changed": 200}
+
+def bench_deadlines(hang_time=30, timeout=0.5):
+    """Tiempo hasta el reporte parcial con colectores falsos que se cuelgan, con plazos y con cancelación."""
+    factory = wmi_simulator.connection_factory()
+    collectors = dict(collector.COLLECTORS, printers=lambda c: time.sleep(hang_time), software=lambda c: time.sleep(hang_time))
+    keys = list(collector.COLLECTORS)
+    start = time.perf_counter()
+    data = collector.collect(keys, factory, collectors=collectors, timeouts={"printers": timeout, "software": 2 * timeout})
+    elapsed = time.perf_counter() - start
+    incomplete = collector.incomplete_sections(data)
+    print(f"Con plazos:    {elapsed:5.2f} s, incompletas: {', '.join(incomplete)} (colgadas {hang_time} s)")
+
+    # Con un solo hilo, la cancelación también descarta las secciones que aún no empezaron
+    cancel = threading.Event()
+    threading.Timer(timeout, cancel.set).start()
+    start = time.perf_counter()
+    data = collector.collect(["software"] + keys, factory, max_workers=1, collectors=collectors, timeouts={"software": None}, cancel=cancel)
+    elapsed = time.perf_counter() - start
+    incomplete = collector.incomplete_sections(data)
+    print(f"Cancelado:     {elapsed:5.2f} s, incompletas: {len(incomplete)} de {len(keys)}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files, errors = report_generator.generate_reports(data, os.path.join(tmp, "parcial"), list(report_generator.FORMATS), parallel=False)
+        with open(files[0], encoding="utf-8") as f: marked = f.read().count(collector.INCOMPLETE)
+    print(f"Reporte parcial: {len(files)} formatos, {marked} marcas de sección incompleta en HTML")
+
+def bench_agent(latency=0.3, formats=(".html", ".xlsx")):
+    """Agente con colectores simulados: latencia de un reporte servido desde memoria frente a recolectar y generar."""
+    factory = wmi_simulator.connection_factory(latency=latency, software=2000)
+    keys = list(collector.COLLECTORS)
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in formats:
+            start = time.perf_counter()
+            data = collector.collect(keys, factory, collectors=SIMULATED_COLLECTORS)
+            generate = next(generate for ext, generate in report_generator.FORMATS.values() if ext == extension)
+            generate(data, os.path.join(tmp, f"reporte{extension}"))
+            print(f"Sin agente  {extension:<5}: {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+    # Reloj falso para comprobar el refresco escalonado sin esperar horas
+    now = [0.0]
+    resident = agent.Agent(keys, connection_factory=factory, software_source="wmi", clock=lambda: now[0])
+    resident.run_pending()
+    now[0] = 6 * 60
+    start = time.perf_counter()
+    refreshed = resident.run_pending()
+    print(f"A los 6 min se refrescan: {', '.join(refreshed)} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+
+    server = agent.AgentServer(resident, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{agent.HOST}:{server.server_address[1]}"
+    try:
+        for extension in formats:
+            start = time.perf_counter()
+            with urllib.request.urlopen(f"{url}/report{extension}") as response: size = len(response.read())
+            print(f"Con agente  {extension:<5}: {(time.perf_counter() - start) * 1000:8.1f} ms ({size / 1024:.0f} KiB)")
+        start = time.perf_counter()
+        data = agent.fetch_data(url, ["cpu", "software"])
+        print(f"JSON cpu+software: {(time.perf_counter() - start) * 1000:8.1f} ms ({len(data['software'])} programas)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+HEAVY_MODULES = ("reportlab", "openpyxl", "tkinter")
+
+def cli_imports(formats):
+    """Ejecuta la CLI con `-X importtime` sobre WMI simulado; devuelve {módulo: µs acumulados}."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        code = ("import InfoSystem_cli, wmi_simulator; "
+                f"InfoSystem_cli.main(['-f', {', '.join(repr(f) for f in formats)}, '-o', {tmp!r}, '--software-source', 'wmi', '--serial'], wmi_simulator.connection_factory())")
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=here, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def bench_imports():
+    """Cuenta los módulos importados por la CLI según los formatos y el tiempo de importación."""
+    for formats in (["html"], ["html", "pdf", "excel"]):
+        modules = cli_imports(formats)
+        heavy = sorted({name.split(".")[0] for name in modules if name.split(".")[0] in HEAVY_MODULES})
+        top_level = sum(us for name, us in modules.items() if "." not in name)
+        print(f"{'+'.join(formats):<15}: {len(modules):4} módulos, {top_level / 1000:7.1f} ms de importación, pesados: {', '.join(heavy) or 'ninguno'}")
+
+# Perfiles de la suite: cantidades de objetos del WMI simulado
+PROFILES = {
+    "small": {"software": 1000, "printers": 12, "disks": 4, "adapters": 4, "modules": 2},
+    "large": {"software": 5000, "printers": 48, "disks": 16, "adapters": 16, "modules": 8},
+}
+
+TOLERANCE = 0.25 # Empeoramiento relativo a partir del cual una medición es una regresión
+MIN_DELTA = 0.005 # Segundos por debajo de los cuales una diferencia de tiempo se considera ruido
+
+def _rows(result):
+    if isinstance(result, (list, tabular.Table)): return len(result)
+    return sum(len(value) if isinstance(value, (list, dict, tabular.Table)) else 1 for value in result.values())
+
+def suite_cases(counts, latency=0.0):
+    """Casos de la suite: {nombre: (función sin argumentos, filas procesadas)}.
+
+    Cubre cada colector get_* del backend sobre una conexión simulada con
+    `counts` objetos y cada generador generate_* de report_generator.
+    """
+    traffic = wmi_simulator.Traffic()
+    factory = wmi_simulator.connection_factory(latency=latency, traffic=traffic, **counts)
+    reader = wmi_simulator.registry(counts["software"])
+    cases = {}
+    for key, function in collector.COLLECTORS.items():
+        if key in collector.FACTORY_COLLECTORS: call = lambda function=function: function(factory)
+        elif key == "software":
+            cases[f"{function.__name__}[registry]"] = lambda function=function: function(factory(), source="registry", reader=reader)
+            call = lambda function=function: function(factory(), source="wmi")
+            key = f"{function.__name__}[wmi]"
+        else: call = lambda function=function: function(factory())
+        cases[key if "[" in key else function.__name__] = call
+
+    data = {key: collector.run_collector(key, factory, SIMULATED_COLLECTORS) for key in collector.COLLECTORS}
+    previous = dict(data, software=data["software"][len(data["software"]) // 10:])
+    delta = snapshot.diff(previous, data)
+    summary = fleet.summarize({f"PC-{i:04d}": {"data": data} for i in range(counts["software"] // 10)})
+    tmp = tempfile.mkdtemp()
+    cases.update({
+        "generate_html": lambda: report_generator.generate_html(data, os.path.join(tmp, "reporte.html")),
+        "generate_pdf": lambda: report_generator.generate_pdf(data, os.path.join(tmp, "reporte.pdf")),
+        "generate_excel": lambda: report_generator.generate_excel(data, os.path.join(tmp, "reporte.xlsx")),
+        "generate_fleet_html": lambda: report_generator.generate_fleet_html(summary, os.path.join(tmp, "flota.html")),
+        "generate_delta_html": lambda: report_generator.generate_delta_html(delta, os.path.join(tmp, "cambios.html"), "PC-0001"),
+    })
+    rows = {"generate_html": _rows(data), "generate_pdf": _rows(data), "generate_excel": _rows(data),
+            "generate_fleet_html": summary["Equipos"], "generate_delta_html": sum(len(rows) for changes in delta.values() for rows in changes.values())}
+    return cases, rows, traffic, tmp
+
+def run_suite(profile="small", latency=0.0, repeat=3):
+    """Ejecuta la suite y devuelve la línea base: latencia (mediana), filas/s, pico de memoria y consultas WMI por caso."""
+    counts = PROFILES[profile]
+    cases, rows, traffic, tmp = suite_cases(counts, latency)
+    results = {}
+    try:
+        for name, call in cases.items():
+            queries = sum(traffic.queries.values())
+            result = call()
+            queries = sum(traffic.queries.values()) - queries
+            # Tiempos sin tracemalloc; el pico de memoria sale de una ejecución aparte
+            seconds = statistics.median(timed(call) for _ in range(repeat))
+            peak = peak_memory(call)
+            count = rows.get(name, _rows(result) if result is not None else 0)
+            results[name] = {"seconds": round(seconds, 5), "rows": count, "rows_per_s": round(count / seconds) if seconds else None,
+                             "peak_mib": round(peak, 3), "queries": queries}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {"profile": profile, "counts": counts, "latency": latency, "repeat": repeat, "python": platform.python_version(),
+            "machine": platform.platform(), "results": results}
+
+def compare(baseline, current, tolerance=TOLERANCE):
+    """Lista de regresiones de `current` frente a `baseline` (mismo perfil): tiempo, memoria o número de consultas."""
+    regressions = []
+    for name, old in baseline["results"].items():
+        new = current["results"].get(name)
+        if new is None:
+            regressions.append(f"{name}: ya no se mide")
+            continue
+        if new["seconds"] > old["seconds"] * (1 + tolerance) and new["seconds"] - old["seconds"] > MIN_DELTA:
+            regressions.append(f"{name}: {old['seconds'] * 1000:.1f} ms -> {new['seconds'] * 1000:.1f} ms")
+        if new["peak_mib"] > old["peak_mib"] * (1 + tolerance) and new["peak_mib"] - old["peak_mib"] > 0.1:
+            regressions.append(f"{name}: pico {old['peak_mib']:.2f} MiB -> {new['peak_mib']:.2f} MiB")
+        if new["queries"] > old["queries"]:
+            regressions.append(f"{name}: {old['queries']} -> {new['queries']} consultas WMI")
+    return regressions
+
+def print_suite(current, baseline=None):
+    print(f"Perfil {current['profile']}: {', '.join(f'{k}={v}' for k, v in current['counts'].items())}, latencia {current['latency'] * 1000:.1f} ms/consulta")
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name) if baseline else None
+        change = f"  ({(result['seconds'] / old['seconds'] - 1) * 100:+6.1f} %)" if old and old["seconds"] else ""
+        rate = f"{result['rows_per_s']:>10} filas/s" if result["rows_per_s"] is not None else " " * 17
+        print(f"{name:<38} {result['seconds'] * 1000:9.2f} ms {rate}  pico {result['peak_mib']:7.2f} MiB  {result['queries']:2} consultas{change}")
+
+BENCHMARKS = {
+    "collect": bench_collect,
+    "cache": bench_cache,
+    "projection": bench_projection,
+    "pool": bench_pool,
+    "software": bench_software,
+    "html": bench_html,
+    "excel": bench_excel,
+    "pdf": bench_pdf,
+    "render": bench_render,
+    "records": bench_records,
+    "imports": bench_imports,
+    "fleet": bench_fleet,
+    "snapshot": bench_snapshot,
+    "deadlines": bench_deadlines,
+    "agent": bench_agent,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de System Info con WMI simulado")
+    parser.add_argument("names", nargs="*", help=f"benchmarks a ejecutar: {', '.join(BENCHMARKS)} (todos por defecto)")
+    parser.add_argument("--suite", action="store_true", help="ejecuta la suite de colectores y generadores en lugar de los benchmarks")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small", help="cantidades de objetos simulados de la suite")
+    parser.add_argument("--latency", type=float, default=0.0, help="milisegundos simulados por consulta WMI en la suite")
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones por caso de la suite (se usa la mediana)")
+    parser.add_argument("--save", metavar="JSON", help="guarda el resultado de la suite como línea base")
+    parser.add_argument("--compare", metavar="JSON", help="compara la suite con una línea base y termina con código 1 si hay regresiones")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="empeoramiento relativo tolerado al comparar (0.25 = 25 %%)")
+    args = parser.parse_args()
+    if args.suite:
+        baseline = None
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f: baseline = json.load(f)
+            # La línea base fija el perfil y la latencia para que la comparación tenga sentido
+            args.profile, args.latency = baseline["profile"], baseline["latency"] * 1000
+        current = run_suite(args.profile, args.latency / 1000, args.repeat)
+        print_suite(current, baseline)
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f: json.dump(current, f, ensure_ascii=False, indent=2)
+        if baseline:
+            regressions = compare(baseline, current, args.tolerance)
+            for regression in regressions: print(f"REGRESIÓN {regression}")
+            sys.exit(1 if regressions else 0)
+        sys.exit(0)
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown: parser.error(f"benchmark desconocido: {', '.join(sorted(unknown))}")
+    for name in args.names or BENCHMARKS:
+        print(f"== {name} ==")
+        BENCHMARKS[name]()
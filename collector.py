@@ -0,0 +1,153 @@
+# collector.py
+
+import contextlib
+import functools
+import queue
+import threading
+import time
+
+import InfoSystem_backend as backend
+import tabular
+import wmi_cache
+import wmi_pool
+
+# Funciones del backend por sección. "disks" recibe la fábrica de conexiones
+# en lugar de una conexión, porque consulta otro namespace.
+COLLECTORS = {
+    "system": backend.get_system_info,
+    "network": backend.get_network_info,
+    "bios": backend.get_bios_info,
+    "cpu": backend.get_cpu_info,
+    "ram": backend.get_ram_info,
+    "disks": backend.get_disk_info,
+    "os": backend.get_os_info,
+    "printers": backend.get_installed_printers,
+    "software": backend.get_installed_software
+}
+
+FACTORY_COLLECTORS = {"disks"}
+
+# Secciones que el backend devuelve como lista de filas
+LIST_SECTIONS = {"disks", "printers", "software"}
+
+MAX_WORKERS = 4
+
+# Segundos que se espera a cada sección desde que empieza; None = sin límite
+TIMEOUTS = {"software": 300, "printers": 60}
+DEFAULT_TIMEOUT = 60
+CANCEL_POLL = 0.1 # Cada cuánto se revisa `cancel` mientras se espera
+
+# Las secciones abandonadas se marcan con un error que empieza por INCOMPLETE
+INCOMPLETE = "Sección incompleta"
+
+def software_collectors(source, collectors=None):
+    """`collectors` (COLLECTORS por defecto) con el inventario de programas leído de `source`: "registry" o "wmi"."""
+    return dict(collectors or COLLECTORS, software=functools.partial(backend.get_installed_software, source=source))
+
+def run_collector(key, connection_factory, collectors=None, trace=None):
+    """Ejecuta un solo colector en un hilo con COM inicializado; si hay `trace`, lo mide."""
+    function = (collectors or COLLECTORS)[key]
+    with wmi_pool.ComApartment(), (trace.collector(key) if trace else contextlib.nullcontext()) as span:
+        if key in FACTORY_COLLECTORS: result = function(connection_factory)
+        else: result = function(connection_factory())
+        if span: span.set_result(result)
+        return result
+
+def section_error(key, message):
+    """Error de una sección con la forma que espera cada generador (lista de filas o diccionario)."""
+    error = {"Error": message}
+    return [error] if key in LIST_SECTIONS else error
+
+def has_error(section_data):
+    """True si la sección es un error ({"Error": ...} o [{"Error": ...}])."""
+    if isinstance(section_data, dict): return "Error" in section_data
+    return tabular.is_error(section_data)
+
+def incomplete_sections(all_data):
+    """Secciones de `all_data` que se abandonaron por tiempo agotado o cancelación."""
+    incomplete = []
+    for key, section_data in all_data.items():
+        error = section_data[0] if isinstance(section_data, list) and section_data else section_data
+        if isinstance(error, dict) and str(error.get("Error", "")).startswith(INCOMPLETE): incomplete.append(key)
+    return incomplete
+
+def collect(keys, connection_factory=None, max_workers=MAX_WORKERS, on_progress=None, cache=None, collectors=None, trace=None,
+            timeouts=None, cancel=None, software_source=None):
+    """Ejecuta los colectores indicados en paralelo sobre un pool acotado.
+
+    Devuelve el mismo diccionario `all_data` que usan los generadores de reportes,
+    con las secciones en el orden de `keys`. `on_progress(key, done, total)` se llama
+    cada vez que termina una sección. Las consultas WMI
+    idénticas se resuelven una sola vez mediante `cache` (una `QueryCache` nueva
+    por reporte si no se indica). `collectors` reemplaza a COLLECTORS, por
+    ejemplo para inyectar un lector de registro remoto; `software_source`
+    ("registry" o "wmi") elige el origen del inventario de programas sin tocar
+    el estado del backend. Con `trace`
+    (instrumentation.Trace) se mide cada colector.
+
+    Cada sección tiene un plazo (`timeouts` se combina con TIMEOUTS; el resto usa
+    DEFAULT_TIMEOUT) que empieza a contar cuando arranca su colector. Una sección
+    que lo supera, o que sigue pendiente cuando se activa el evento `cancel`, se
+    abandona y se marca con un error INCOMPLETE, de modo que los generadores
+    producen un reporte parcial. Un hilo colgado en una llamada COM no se puede
+    interrumpir: se deja terminar en segundo plano y otro hilo ocupa su lugar.
+
+    Sin `connection_factory` las conexiones salen de `wmi_pool.default_pool`: una
+    por namespace, reutilizadas entre reportes del mismo proceso.
+    """
+    keys = list(dict.fromkeys(keys))
+    if software_source: collectors = software_collectors(software_source, collectors)
+    if connection_factory is None: connection_factory = wmi_pool.default_pool.factory_for()
+    if cache is None: cache = wmi_cache.QueryCache()
+    connection_factory = wmi_cache.cached_factory(connection_factory, cache)
+    budgets = {key: {**TIMEOUTS, **(timeouts or {})}.get(key, DEFAULT_TIMEOUT) for key in keys}
+    pending, events = queue.Queue(), queue.Queue()
+    for key in keys: pending.put(key)
+    started, results, abandoned = {}, {}, set()
+
+    def worker():
+        # Hilos daemon: uno colgado no impide que el proceso termine
+        while not (cancel and cancel.is_set()):
+            try: key = pending.get_nowait()
+            except queue.Empty: return
+            events.put((key, "start", time.monotonic()))
+            try: result = run_collector(key, connection_factory, collectors, trace)
+            except Exception as e: result = section_error(key, f"No se pudo obtener la sección {key}: {e}")
+            events.put((key, "end", result))
+            if key in abandoned: return # Ya se lanzó otro hilo en su lugar
+
+    def spawn():
+        threading.Thread(target=worker, daemon=True, name="collector").start()
+
+    def finish(key, result):
+        results[key] = result
+        if on_progress: on_progress(key, len(results), len(keys))
+
+    def abandon(key, message):
+        abandoned.add(key)
+        if trace: trace.abandon_collector(key, message, time.monotonic() - started[key] if key in started else 0.0)
+        finish(key, section_error(key, message))
+
+    for _ in range(min(max_workers, len(keys))): spawn()
+    while len(results) < len(keys):
+        if cancel and cancel.is_set(): break
+        now = time.monotonic()
+        deadlines = {key: started[key] + budgets[key] for key in started if key not in results and budgets[key] is not None}
+        wait = min(deadlines.values(), default=None)
+        if wait is not None: wait = max(0, wait - now)
+        if cancel: wait = CANCEL_POLL if wait is None else min(wait, CANCEL_POLL)
+        try:
+            key, phase, value = events.get(timeout=wait)
+        except queue.Empty:
+            now = time.monotonic()
+            for key, deadline in deadlines.items():
+                if now >= deadline:
+                    abandon(key, f"{INCOMPLETE}: sin respuesta tras {budgets[key]:g} s")
+                    spawn()
+            continue
+        if phase == "start": started[key] = value
+        elif key not in results: finish(key, value)
+
+    for key in keys:
+        if key not in results: abandon(key, f"{INCOMPLETE}: recolección cancelada")
+    return {key: results[key] for key in keys}
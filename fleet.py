@@ -0,0 +1,162 @@
+# fleet.py
+
+# Modo flota: inventario concurrente de muchos equipos remotos. Ejecuta los
+# mismos colectores de InfoSystem_backend contra cada equipo, escribe un reporte
+# por equipo y un resumen combinado de toda la flota.
+
+import argparse
+import collections
+import concurrent.futures
+import datetime
+import functools
+import getpass
+import json
+import os
+import sys
+import threading
+
+import InfoSystem_backend as backend
+import collector
+import report_generator as reporter
+import software_inventory
+import wmi_pool
+from InfoSystem_cli import FORMAT_NAMES
+
+MAX_HOSTS = 32 # Equipos recolectados a la vez
+HOST_TIMEOUT = 120 # Segundos por intento antes de abandonar un equipo
+RETRIES = 1 # Reintentos por equipo tras un error o un timeout
+
+def remote_pool(user=None, password=None):
+    """Pool de conexiones remotas; `pool.factory_for` es la host_factory(host) -> connect(namespace=None) por defecto."""
+    return wmi_pool.ConnectionPool(functools.partial(wmi_pool.wmi_factory, user=user, password=password))
+
+def remote_registry(connect):
+    """Lector del registro remoto por StdRegProv, sobre la misma conexión WMI autenticada del equipo (`connect`)."""
+    return software_inventory.WmiRegistryReader(connect(software_inventory.REGISTRY_NAMESPACE))
+
+def _run_with_timeout(function, timeout):
+    # Un hilo colgado en una llamada COM no se puede interrumpir: se abandona
+    outcome = {}
+    def target():
+        try: outcome["value"] = function()
+        except Exception as e: outcome["error"] = e
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive(): raise TimeoutError(f"sin respuesta tras {timeout} s")
+    if "error" in outcome: raise outcome["error"]
+    return outcome["value"]
+
+def _collect_once(host, sections, host_factory, registry_factory):
+    connect = host_factory(host)
+    with wmi_pool.ComApartment():
+        connect() # Falla aquí si el equipo no responde, para poder reintentar
+    def software(c):
+        reader = registry_factory(host) if registry_factory else remote_registry(connect)
+        return backend.get_installed_software(c, source="registry", reader=reader)
+    collectors = dict(collector.COLLECTORS, software=software, os=lambda c: backend.get_os_info(c, local=False))
+    data = collector.collect(sections, connect, collectors=collectors)
+    if isinstance(data.get("network"), dict) and "Error" not in data["network"]:
+        # get_network_info lee el hostname y el usuario de la máquina local
+        data["network"]["Hostname"] = host
+        data["network"].pop("Usuario Actual", None)
+    return data
+
+def collect_host(host, sections=tuple(collector.COLLECTORS), host_factory=None, registry_factory=None, timeout=HOST_TIMEOUT, retries=RETRIES):
+    """Recolecta un equipo con timeout por intento. Devuelve (datos, intentos); relanza el último error."""
+    host_factory = host_factory or remote_pool().factory_for
+    for attempt in range(1, retries + 2):
+        try:
+            return _run_with_timeout(functools.partial(_collect_once, host, sections, host_factory, registry_factory), timeout), attempt
+        except Exception:
+            if attempt > retries: raise
+
+def summarize(results):
+    """Resumen combinado de la flota a partir de {host: resultado}."""
+    cpu, ram, os_names = collections.Counter(), collections.Counter(), collections.Counter()
+    failed = {}
+    for host, result in sorted(results.items()):
+        if "Error" in result:
+            failed[host] = result["Error"]
+            continue
+        data = result["data"]
+        cpu[data.get("cpu", {}).get("Generación / Serie", "No disponible")] += 1
+        ram[data.get("ram", {}).get("RAM Total", "No disponible")] += 1
+        os_names[data.get("os", {}).get("Sistema Operativo", "No disponible")] += 1
+    return {
+        "Equipos": len(results),
+        "Correctos": len(results) - len(failed),
+        "Generación de CPU": dict(cpu.most_common()),
+        "RAM Total": dict(ram.most_common()),
+        "Sistema Operativo": dict(os_names.most_common()),
+        "Equipos con error": failed,
+    }
+
+def run_fleet(hosts, sections=tuple(collector.COLLECTORS), formats=("HTML",), output_dir=".", host_factory=None,
+              registry_factory=None, max_hosts=MAX_HOSTS, timeout=HOST_TIMEOUT, retries=RETRIES, on_progress=None,
+              user=None, password=None):
+    """Recolecta todos los equipos con concurrencia acotada y escribe un reporte por equipo y el resumen.
+
+    Sin `host_factory` se usan conexiones remotas de un pool (con `user` y
+    `password`), una por equipo y namespace, que se cierran al terminar cada equipo.
+    Sin `registry_factory(host)` los programas se leen con StdRegProv por esa
+    misma conexión (ver `remote_registry`).
+    Devuelve (resumen, {host: resultado}). `on_progress(host, done, total)` se
+    llama cada vez que termina un equipo.
+    """
+    hosts = list(dict.fromkeys(hosts))
+    connections = None
+    if host_factory is None:
+        connections = remote_pool(user, password)
+        host_factory = connections.factory_for
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def process(host):
+        try:
+            data, attempts = collect_host(host, sections, host_factory, registry_factory, timeout, retries)
+        except Exception as e:
+            return {"Error": str(e) or type(e).__name__}
+        finally:
+            if connections: connections.close(host)
+        base_filename = os.path.join(output_dir, f"reporte_sistema_{host}_{timestamp}")
+        files, errors = reporter.generate_reports(data, base_filename, formats, parallel=False)
+        return {"data": data, "attempts": attempts, "files": files, "errors": errors}
+
+    results = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_hosts) as pool:
+        futures = {pool.submit(process, host): host for host in hosts}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if on_progress: on_progress(futures[future], done, len(hosts))
+
+    summary = summarize(results)
+    base_filename = os.path.join(output_dir, f"resumen_flota_{timestamp}")
+    with open(f"{base_filename}.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    reporter.generate_fleet_html(summary, f"{base_filename}.html")
+    return summary, results
+
+def read_hosts(filename):
+    """Un equipo por línea; se ignoran las líneas vacías y los comentarios (#)."""
+    with open(filename, encoding="utf-8") as f:
+        return [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inventario concurrente de una flota de equipos remotos.")
+    parser.add_argument("hosts_file", help="archivo con un equipo por línea")
+    parser.add_argument("-s", "--sections", nargs="+", choices=list(collector.COLLECTORS), default=list(collector.COLLECTORS), metavar="SECCION")
+    parser.add_argument("-f", "--formats", nargs="+", choices=list(FORMAT_NAMES), default=["html"], metavar="FORMATO")
+    parser.add_argument("-o", "--output-dir", default="flota")
+    parser.add_argument("-u", "--user", help="usuario para las conexiones remotas (se pide la contraseña)")
+    parser.add_argument("--max-hosts", type=int, default=MAX_HOSTS)
+    parser.add_argument("--timeout", type=float, default=HOST_TIMEOUT)
+    parser.add_argument("--retries", type=int, default=RETRIES)
+    args = parser.parse_args()
+
+    password = getpass.getpass(f"Contraseña de {args.user}: ") if args.user else None
+    summary, results = run_fleet(read_hosts(args.hosts_file), args.sections, [FORMAT_NAMES[f] for f in args.formats], args.output_dir,
+                                 max_hosts=args.max_hosts, timeout=args.timeout, retries=args.retries,
+                                 on_progress=lambda host, done, total: print(f"[{done}/{total}] {host}"), user=args.user, password=password)
+    print(f"{summary['Correctos']}/{summary['Equipos']} equipos recolectados")
+    sys.exit(1 if summary["Equipos con error"] else 0)
@@ -0,0 +1,104 @@
+# instrumentation.py
+
+# Traza de rendimiento de un reporte: por colector, tiempo, consultas WMI, filas
+# y excepciones capturadas; por formato, tiempo de generación, filas y error. Los
+# suscriptores reciben los eventos a medida que ocurren (p. ej. la barra de
+# progreso de la GUI).
+
+import datetime
+import json
+import socket
+import threading
+import time
+
+import tabular
+
+_current = threading.local()
+
+class Trace:
+    def __init__(self):
+        self.started = datetime.datetime.now().isoformat(timespec="seconds")
+        self.collectors = {}
+        self.renderers = {}
+        self._subscribers = []
+        self._abandoned = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """`callback(event)` recibe dicts con "type" ("collector" o "renderer"), "name" y "phase" ("start" o "end")."""
+        self._subscribers.append(callback)
+
+    def _emit(self, **event):
+        for callback in self._subscribers: callback(event)
+
+    def collector(self, name):
+        """Contexto que mide un colector; dentro, record_query y record_exception se atribuyen a él."""
+        return _CollectorSpan(self, name)
+
+    def abandon_collector(self, name, reason, wall_time):
+        """Cierra la medición de un colector que se dejó de esperar; si termina más tarde, no se vuelve a registrar."""
+        entry = {"wall_time": round(wall_time, 4), "queries": 0, "rows": 0, "exceptions": [reason]}
+        with self._lock:
+            self._abandoned.add(name)
+            self.collectors[name] = entry
+        self._emit(type="collector", name=name, phase="end", **entry)
+
+    def record_renderer(self, name, wall_time, error=None, rows=0):
+        """Registra un formato generado: tiempo, error y filas de entrada (ver `report_rows`)."""
+        with self._lock: self.renderers[name] = {"wall_time": round(wall_time, 4), "rows": rows, "error": error}
+        self._emit(type="renderer", name=name, phase="end", **self.renderers[name])
+
+    def to_dict(self):
+        return {"host": socket.gethostname(), "started": self.started, "collectors": self.collectors, "renderers": self.renderers}
+
+    def save(self, filename):
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def footer_lines(self):
+        """Resumen corto para el pie de los reportes."""
+        times = ", ".join(f"{name} {entry['wall_time']:.2f} s" for name, entry in self.collectors.items())
+        errors = sum(len(entry["exceptions"]) for entry in self.collectors.values())
+        queries = sum(entry["queries"] for entry in self.collectors.values())
+        return [f"Tiempos de recolección: {times}", f"Consultas WMI: {queries} · Errores registrados: {errors}"]
+
+class _CollectorSpan:
+    def __init__(self, trace, name):
+        self.trace, self.name = trace, name
+        self.entry = {"wall_time": 0.0, "queries": 0, "rows": 0, "exceptions": []}
+
+    def __enter__(self):
+        _current.span = self
+        self.start = time.perf_counter()
+        self.trace._emit(type="collector", name=self.name, phase="start")
+        return self
+
+    def set_result(self, result):
+        if isinstance(result, tabular.Table):
+            self.entry["rows"] = len(result)
+            return
+        rows = result if isinstance(result, list) else [result]
+        self.entry["rows"] = sum(1 for row in rows if "Error" not in row)
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.span = None
+        self.entry["wall_time"] = round(time.perf_counter() - self.start, 4)
+        if exc is not None: self.entry["exceptions"].append(f"{exc_type.__name__}: {exc}")
+        with self.trace._lock:
+            if self.name in self.trace._abandoned: return
+            self.trace.collectors[self.name] = self.entry
+        self.trace._emit(type="collector", name=self.name, phase="end", **self.entry)
+
+def report_rows(all_data):
+    """Filas que escribe un reporte de `all_data`: una por campo de cada sección de diccionario y una por fila de cada lista."""
+    return sum(len(section_data) for section_data in all_data.values() if isinstance(section_data, (dict, list, tabular.Table)))
+
+def record_query():
+    """Cuenta una consulta WMI del colector que se está midiendo en este hilo (si lo hay)."""
+    span = getattr(_current, "span", None)
+    if span: span.entry["queries"] += 1
+
+def record_exception(e):
+    """Registra una excepción capturada por el colector que se está midiendo en este hilo (si lo hay)."""
+    span = getattr(_current, "span", None)
+    if span: span.entry["exceptions"].append(f"{type(e).__name__}: {e}")
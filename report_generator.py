@@ -1,18 +1,24 @@
 # report_generator.py
 
+import concurrent.futures
 import datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-
-def generate_html(data, filename):
-    """Genera el reporte en formato HTML a partir de los datos recolectados."""
-    style = """... (El mismo <style> que tenías en tu script original) ..."""
-   
-    style = """
+import pickle
+import socket
+import time
+from html import escape
+
+import instrumentation
+import tabular
+
+# reportlab y openpyxl se importan dentro de generate_pdf y generate_excel:
+# un reporte solo HTML no necesita cargarlos.
+
+def default_base_filename():
+    """Nombre base estándar de los reportes: hostname más fecha y hora."""
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"reporte_sistema_{socket.gethostname()}_{timestamp}"
+
+HTML_STYLE = """
     <style>
         body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; background-color: #f4f4f9; color: #333; margin: 0; padding: 20px; }
         .container { max-width: 900px; margin: auto; background: #fff; padding: 20px; border-radius: 8px; box-shadow: 0 0 15px rgba(0,0,0,0.1); }
@@ -27,61 +33,137 @@ def generate_html(data, filename):
         .footer { text-align: center; margin-top: 30px; font-size: 0.9em; color: #777; }
     </style>
     """
-    html = f"<!DOCTYPE html><html lang='es'><head><meta charset='UTF-8'><title>Reporte del Sistema</title>{style}</head><body>"
-    html += "<div class='container'><h1>Reporte de Información del Sistema</h1>"
-    
+
+MISSING = "N/A" # Valor de una columna que falta en una fila de lista
+
+def _escape(value):
+    return escape(str(value), quote=False)
+
+def generate_html(data, filename, footer=None):
+    """Genera el reporte en formato HTML a partir de los datos recolectados."""
+    with open(filename, "w", encoding="utf-8") as f:
+        render_html(data, f, footer)
+
+def render_html(data, out, footer=None):
+    """Escribe el reporte HTML en `out` (cualquier objeto con .write) a medida que se genera cada fila.
+
+    `footer` son líneas adicionales para el pie (p. ej. Trace.footer_lines()).
+    """
+    write = out.write
+    write(f"<!DOCTYPE html><html lang='es'><head><meta charset='UTF-8'><title>Reporte del Sistema</title>{HTML_STYLE}</head><body>")
+    write("<div class='container'><h1>Reporte de Información del Sistema</h1>")
+
+    def write_info_table(title, items):
+        write(f"<h2>{title}</h2><table class='info-table'>")
+        for key, value in items: write(f"<tr><td>{_escape(key)}</td><td>{_escape(value)}</td></tr>")
+        write("</table>")
+
     if 'system' in data and 'network' in data:
-        html += "<h2>Información General y de Usuario</h2><table class='info-table'>"
-        for key, value in {**data['system'], **data['network']}.items(): html += f"<tr><td>{key}</td><td>{value}</td></tr>"
-        html += "</table>"
+        write_info_table("Información General y de Usuario", {**data['system'], **data['network']}.items())
     if 'bios' in data and 'ram' in data:
-        html += "<h2>Hardware</h2><table class='info-table'>"
-        for key, value in {**data['bios'], **data['ram']}.items(): html += f"<tr><td>{key}</td><td>{value}</td></tr>"
-        html += "</table>"
+        write_info_table("Hardware", {**data['bios'], **data['ram']}.items())
     if 'cpu' in data:
-        html += "<h2>Procesador (CPU)</h2><table class='info-table'>"
-        for key, value in data['cpu'].items(): html += f"<tr><td>{key}</td><td>{value}</td></tr>"
-        html += "</table>"
+        write_info_table("Procesador (CPU)", data['cpu'].items())
+    def write_list_table(title, headers, section_data, columns=None, empty=None):
+        write(f"<h2>{title}</h2><table><tr>{''.join(f'<th>{header}</th>' for header in headers)}</tr>")
+        if tabular.is_error(section_data): write(f"<tr><td colspan='{len(headers)}'>{_escape(section_data[0]['Error'])}</td></tr>")
+        elif not section_data and empty: write(f"<tr><td colspan='{len(headers)}'>{empty}</td></tr>")
+        else:
+            # Las filas ya vienen en el orden de las columnas: sin búsquedas de claves por fila
+            for row in tabular.as_table(section_data, columns or headers, MISSING):
+                write("<tr><td>" + "</td><td>".join(map(_escape, row)) + "</td></tr>")
+        write("</table>")
+
     if 'disks' in data:
-        html += "<h2>Discos de Almacenamiento</h2><table><tr><th>Fabricante</th><th>Capacidad Total</th><th>Número de Serie</th></tr>"
-        for disk in data['disks']:
-            if "Error" in disk: html += f"<tr><td colspan='3'>{disk['Error']}</td></tr>"
-            else: html += f"<tr><td>{disk.get('Fabricante', 'N/A')}</td><td>{disk.get('Capacidad Total', 'N/A')}</td><td>{disk.get('Número de Serie', 'N/A')}</td></tr>"
-        html += "</table>"
+        write_list_table("Discos de Almacenamiento", ["Fabricante", "Capacidad Total", "Número de Serie"], data['disks'])
     if 'os' in data:
-        html += "<h2>Sistema Operativo</h2><table class='info-table'>"
-        for key, value in data['os'].items(): html += f"<tr><td>{key}</td><td>{value}</td></tr>"
-        html += "</table>"
+        write_info_table("Sistema Operativo", data['os'].items())
     if 'printers' in data:
-        html += "<h2>Impresoras Instaladas</h2><table><tr><th>Nombre</th><th>Controlador</th><th>Puerto</th><th>Predeterminada</th></tr>"
-        if not data['printers']: html += "<tr><td colspan='4'>No se encontraron impresoras.</td></tr>"
-        else:
-            for printer in data['printers']:
-                if "Error" in printer: html += f"<tr><td colspan='4'>{printer['Error']}</td></tr>"
-                else: html += f"<tr><td>{printer['Nombre']}</td><td>{printer['Controlador']}</td><td>{printer['Puerto']}</td><td>{printer['Default']}</td></tr>"
-        html += "</table>"
+        write_list_table("Impresoras Instaladas", ["Nombre", "Controlador", "Puerto", "Predeterminada"], data['printers'],
+                         ["Nombre", "Controlador", "Puerto", "Default"], "No se encontraron impresoras.")
     if 'software' in data:
-        html += "<h2>Programas Instalados</h2><table><tr><th>Nombre</th><th>Versión</th><th>Vendedor</th></tr>"
-        if not data['software']: html += "<tr><td colspan='3'>No se encontraron programas.</td></tr>"
-        else:
-            for sw in data['software']:
-                if "Error" in sw: html += f"<tr><td colspan='3'>{sw['Error']}</td></tr>"
-                else: html += f"<tr><td>{sw['Nombre']}</td><td>{sw.get('Versión','N/A')}</td><td>{sw.get('Vendedor','N/A')}</td></tr>"
-        html += "</table>"
+        write_list_table("Programas Instalados", ["Nombre", "Versión", "Vendedor"], data['software'], empty="No se encontraron programas.")
 
     report_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    html += f"<div class='footer'>Reporte generado el {report_time}</div></div></body></html>"
+    extra = "".join(f"<br>{_escape(line)}" for line in footer or [])
+    write(f"<div class='footer'>Reporte generado el {report_time}{extra}</div></div></body></html>")
 
+def generate_fleet_html(summary, filename):
+    """Genera el resumen HTML de una flota a partir de fleet.summarize."""
     with open(filename, "w", encoding="utf-8") as f:
-        f.write(html)
+        write = f.write
+        write(f"<!DOCTYPE html><html lang='es'><head><meta charset='UTF-8'><title>Resumen de la Flota</title>{HTML_STYLE}</head><body>")
+        write("<div class='container'><h1>Resumen de la Flota</h1>")
+        write(f"<table class='info-table'><tr><td>Equipos</td><td>{summary['Equipos']}</td></tr><tr><td>Correctos</td><td>{summary['Correctos']}</td></tr></table>")
+        for title in ("Generación de CPU", "RAM Total", "Sistema Operativo"):
+            write(f"<h2>{title}</h2><table><tr><th>Valor</th><th>Equipos</th></tr>")
+            for value, count in summary[title].items(): write(f"<tr><td>{_escape(value)}</td><td>{count}</td></tr>")
+            write("</table>")
+        if summary["Equipos con error"]:
+            write("<h2>Equipos con Error</h2><table><tr><th>Equipo</th><th>Error</th></tr>")
+            for host, error in summary["Equipos con error"].items(): write(f"<tr><td>{_escape(host)}</td><td>{_escape(error)}</td></tr>")
+            write("</table>")
+        report_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        write(f"<div class='footer'>Resumen generado el {report_time}</div></div></body></html>")
+
+SECTION_TITLES = {
+    "system": "Información del Sistema", "network": "Red y Usuario", "bios": "BIOS", "cpu": "Procesador (CPU)",
+    "ram": "Memoria RAM", "disks": "Discos", "os": "Sistema Operativo", "printers": "Impresoras", "software": "Software Instalado",
+}
+
+def generate_delta_html(delta, filename, hostname):
+    """Genera el reporte de cambios (snapshot.diff) respecto a la instantánea anterior."""
+    def describe(row):
+        return " / ".join(f"{key}: {value}" for key, value in row.items())
+
+    with open(filename, "w", encoding="utf-8") as f:
+        write = f.write
+        write(f"<!DOCTYPE html><html lang='es'><head><meta charset='UTF-8'><title>Cambios del Sistema</title>{HTML_STYLE}</head><body>")
+        write(f"<div class='container'><h1>Cambios en {_escape(hostname)}</h1>")
+        if not delta: write("<p>No hay cambios desde la instantánea anterior.</p>")
+        for key, changes in delta.items():
+            write(f"<h2>{SECTION_TITLES.get(key, key)}</h2><table><tr><th>Cambio</th><th>Antes</th><th>Ahora</th></tr>")
+            for row in changes["added"]: write(f"<tr><td>Añadido</td><td></td><td>{_escape(describe(row))}</td></tr>")
+            for row in changes["removed"]: write(f"<tr><td>Eliminado</td><td>{_escape(describe(row))}</td><td></td></tr>")
+            for change in changes["changed"]:
+                if "Campo" in change: before, after = f"{change['Campo']}: {change['Antes']}", f"{change['Campo']}: {change['Ahora']}"
+                else: before, after = describe(change["Antes"]), describe(change["Ahora"])
+                write(f"<tr><td>Modificado</td><td>{_escape(before)}</td><td>{_escape(after)}</td></tr>")
+            write("</table>")
+        report_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        write(f"<div class='footer'>Reporte generado el {report_time}</div></div></body></html>")
+
+# Anchos fijos (en puntos) de las listas grandes; suman el ancho útil de una página carta
+PDF_LIST_WIDTHS = {
+    "Discos": [170, 110, 188],
+    "Impresoras": [150, 140, 108, 70],
+    "Software Instalado": [238, 100, 130],
+}
+PDF_LARGE_LIST_ROWS = 2000 # A partir de cuántas filas una lista usa el modo de listas grandes
+PDF_CELL_PADDING = 6 # Relleno horizontal por defecto de las celdas de reportlab
+PDF_CHUNK_ROWS = 40 # Filas por tabla, aproximadamente una página
+
+def generate_pdf(data, filename, large_list_rows=PDF_LARGE_LIST_ROWS, footer=None):
+    """Genera el reporte PDF.
+
+    Las listas con más de `large_list_rows` filas se dividen en tablas de
+    PDF_CHUNK_ROWS filas con anchos fijos y el encabezado repetido, para que
+    reportlab no tenga que medir ni partir una única tabla enorme.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.pdfbase.pdfmetrics import stringWidth
 
-def generate_pdf(data, filename):
     doc = SimpleDocTemplate(filename, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
 
     title_style = ParagraphStyle('Title', parent=styles['h1'], alignment=1, spaceAfter=20, textColor=colors.darkblue)
     heading_style = ParagraphStyle('Heading2', parent=styles['h2'], spaceBefore=10, spaceAfter=10, textColor=colors.darkslateblue)
+    cell_style = ParagraphStyle('Cell', parent=styles['Normal'], fontName='Helvetica', fontSize=10, leading=12)
+    error_style = ParagraphStyle('Error', parent=styles['Normal'], textColor=colors.darkred)
     
     story.append(Paragraph("Reporte de Información del Sistema", title_style))
 
@@ -96,8 +178,15 @@ def generate_pdf(data, filename):
         ('GRID', (0,0), (-1,-1), 1, colors.black)
     ])
     
+    def create_error(title, error):
+        # Sección con error o incompleta (tiempo agotado, cancelada): se muestra marcada, como en HTML
+        story.append(Paragraph(title, heading_style))
+        story.append(Paragraph(escape(str(error)), error_style))
+        story.append(Spacer(1, 12))
+
     def create_table(title, section_data):
-        if not section_data or 'Error' in section_data: return
+        if not section_data: return
+        if 'Error' in section_data: return create_error(title, section_data['Error'])
         story.append(Paragraph(title, heading_style))
         table_data = list(section_data.items())
         t = Table(table_data, colWidths=[150, 300])
@@ -105,23 +194,30 @@ def generate_pdf(data, filename):
         story.append(t)
         story.append(Spacer(1, 12))
 
-    def create_list_table(title, headers, section_data):
-        if not section_data or "Error" in section_data[0]: return
+    def create_list_table(title, headers, section_data, columns=None):
+        if not section_data: return
+        if tabular.is_error(section_data): return create_error(title, section_data[0]["Error"])
         story.append(Paragraph(title, heading_style))
-        table_data = [headers]
-        keys = [h.lower().replace(" ", "_") for h in headers] # Simplificado, asume consistencia
-        
-        # Mapeo de claves para flexibilidad
-        key_map = {
-            "nombre": "Nombre", "fabricante": "Fabricante", "capacidad_total": "Capacidad Total", 
-            "número_de_serie": "Número de Serie", "controlador": "Controlador", "puerto": "Puerto",
-            "predeterminada": "Default", "versión": "Versión", "vendedor": "Vendedor"
-        }
-
-        for item in section_data:
-            row = [item.get(key_map.get(k, k.capitalize()), "N/A") for k in keys]
-            table_data.append(row)
-        
+        # Filas con las columnas en el orden de los encabezados
+        rows = tabular.as_table(section_data, columns or headers, MISSING)
+
+        if large_list_rows is not None and len(rows) > large_list_rows and title in PDF_LIST_WIDTHS:
+            # Modo de listas grandes: anchos fijos y tablas de una página. Solo los valores que no
+            # caben en su columna se envuelven en un Paragraph (que parte el texto en líneas y es caro)
+            widths = [width - 2 * PDF_CELL_PADDING for width in PDF_LIST_WIDTHS[title]]
+            def cell(value, width):
+                text = str(value)
+                if stringWidth(text, cell_style.fontName, cell_style.fontSize) <= width: return text
+                return Paragraph(escape(text), cell_style)
+            for start in range(0, len(rows), PDF_CHUNK_ROWS):
+                chunk = [headers] + [[cell(value, width) for value, width in zip(row, widths)] for row in rows.rows[start:start + PDF_CHUNK_ROWS]]
+                t = Table(chunk, colWidths=PDF_LIST_WIDTHS[title], repeatRows=1)
+                t.setStyle(table_style)
+                story.append(t)
+            story.append(Spacer(1, 12))
+            return
+
+        table_data = [headers] + [list(row) for row in rows]
         t = Table(table_data)
         t.setStyle(table_style)
         story.append(t)
@@ -135,54 +231,131 @@ def generate_pdf(data, filename):
     if 'os' in data: create_table("Sistema Operativo", data['os'])
 
     if 'disks' in data: create_list_table("Discos", ["Fabricante", "Capacidad Total", "Número de Serie"], data['disks'])
-    if 'printers' in data: create_list_table("Impresoras", ["Nombre", "Controlador", "Puerto", "Predeterminada"], data['printers'])
+    if 'printers' in data: create_list_table("Impresoras", ["Nombre", "Controlador", "Puerto", "Predeterminada"], data['printers'], ["Nombre", "Controlador", "Puerto", "Default"])
     if 'software' in data: create_list_table("Software Instalado", ["Nombre", "Versión", "Vendedor"], data['software'])
 
+    if footer:
+        footer_style = ParagraphStyle('Footer', parent=styles['Normal'], fontSize=8, textColor=colors.grey)
+        for line in footer: story.append(Paragraph(escape(line), footer_style))
+
     doc.build(story)
 
-def generate_excel(data, filename):
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Resumen"
+def generate_excel(data, filename, write_only=True, footer=None):
+    """Genera el reporte Excel agregando filas completas.
+
+    Con `write_only` (por defecto) las hojas se escriben en streaming y openpyxl no
+    mantiene las celdas en memoria hasta `wb.save`; con `write_only=False` se usa un
+    libro normal, cuyas celdas quedan todas en memoria.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.utils import get_column_letter
+    from openpyxl.styles import Font
+
+    wb = Workbook(write_only=write_only)
+    if not write_only: wb.remove(wb.active)
+    ws = wb.create_sheet("Resumen")
 
     header_font = Font(bold=True, size=12)
     title_font = Font(bold=True, size=14, color="004A69BD")
+    error_font = Font(bold=True, color="00A00000")
 
-    def write_section(ws, title, section_data, row_cursor):
-        if not section_data or "Error" in section_data: return row_cursor
-        ws.cell(row=row_cursor, column=1, value=title).font = title_font
-        row_cursor += 1
-        for key, value in section_data.items():
-            ws.cell(row=row_cursor, column=1, value=key).font = header_font
-            ws.cell(row=row_cursor, column=2, value=str(value)) # Asegurar que todo sea string
-            row_cursor += 1
-        return row_cursor + 1 # Deja un espacio
-
-    row = 1
-    if 'system' in data: row = write_section(ws, "Información del Sistema", data['system'], row)
-    if 'network' in data: row = write_section(ws, "Red y Usuario", data['network'], row)
-    if 'bios' in data: row = write_section(ws, "BIOS", data['bios'], row)
-    if 'cpu' in data: row = write_section(ws, "Procesador (CPU)", data['cpu'], row)
-    if 'ram' in data: row = write_section(ws, "Memoria RAM", data['ram'], row)
-    if 'os' in data: row = write_section(ws, "Sistema Operativo", data['os'], row)
-    
+    def styled(ws, value, font):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = font
+        return cell
+
+    # En modo write-only los anchos deben definirse antes de escribir la primera fila
     ws.column_dimensions['A'].width = 30
     ws.column_dimensions['B'].width = 50
 
-    def write_list_sheet(wb, title, headers, section_data):
-        if not section_data or 'Error' in section_data[0]: return
+    def write_section(ws, title, section_data, first):
+        if not section_data: return first
+        if not first: ws.append([]) # Deja un espacio
+        ws.append([styled(ws, title, title_font)])
+        if "Error" in section_data:
+            # Sección con error o incompleta (tiempo agotado, cancelada): se deja marcada
+            ws.append([styled(ws, "Error", error_font), str(section_data["Error"])])
+            return False
+        for key, value in section_data.items():
+            ws.append([styled(ws, key, header_font), str(value)]) # Asegurar que todo sea string
+        return False
+
+    first = True
+    if 'system' in data: first = write_section(ws, "Información del Sistema", data['system'], first)
+    if 'network' in data: first = write_section(ws, "Red y Usuario", data['network'], first)
+    if 'bios' in data: first = write_section(ws, "BIOS", data['bios'], first)
+    if 'cpu' in data: first = write_section(ws, "Procesador (CPU)", data['cpu'], first)
+    if 'ram' in data: first = write_section(ws, "Memoria RAM", data['ram'], first)
+    if 'os' in data: first = write_section(ws, "Sistema Operativo", data['os'], first)
+    if footer:
+        ws.append([])
+        for line in footer: ws.append([line])
+
+    def write_list_sheet(wb, title, section_data):
+        if not section_data: return
         ws_list = wb.create_sheet(title)
-        for i, header in enumerate(headers, 1):
-            ws_list.cell(row=1, column=i, value=header).font = header_font
-            ws_list.column_dimensions[chr(64+i)].width = 30 if i > 1 else 50
-        
-        keys = list(section_data[0].keys()) # Asume que todas las entradas tienen las mismas claves
-        for r_idx, item in enumerate(section_data, 2):
-            for c_idx, key in enumerate(keys, 1):
-                ws_list.cell(row=r_idx, column=c_idx, value=str(item.get(key, 'N/A')))
-    
-    if 'disks' in data: write_list_sheet(wb, "Discos", list(data['disks'][0].keys()), data['disks'])
-    if 'printers' in data: write_list_sheet(wb, "Impresoras", list(data['printers'][0].keys()), data['printers'])
-    if 'software' in data: write_list_sheet(wb, "Software", list(data['software'][0].keys()), data['software'])
+        if tabular.is_error(section_data):
+            ws_list.column_dimensions['A'].width = 80
+            ws_list.append([styled(ws_list, str(section_data[0]['Error']), error_font)])
+            return
+        # Los encabezados son las columnas de la tabla; las filas ya vienen en ese orden
+        table = tabular.as_table(section_data, default=MISSING)
+        for i in range(1, len(table.columns) + 1):
+            ws_list.column_dimensions[get_column_letter(i)].width = 30 if i > 1 else 50
+        ws_list.append([styled(ws_list, header, header_font) for header in table.columns])
+        for row in table:
+            ws_list.append([str(value) for value in row])
+
+    if 'disks' in data: write_list_sheet(wb, "Discos", data['disks'])
+    if 'printers' in data: write_list_sheet(wb, "Impresoras", data['printers'])
+    if 'software' in data: write_list_sheet(wb, "Software", data['software'])
+
+    wb.save(filename)
+
+# Formatos disponibles: nombre -> (extensión, generador)
+FORMATS = {
+    "HTML": (".html", generate_html),
+    "PDF": (".pdf", generate_pdf),
+    "Excel": (".xlsx", generate_excel),
+}
+
+def _render_format(fmt, payload, filename, footer=None):
+    # El tiempo se mide en el proceso que genera el formato: sin el arranque del pool ni la espera por los demás
+    start = time.perf_counter()
+    FORMATS[fmt][1](pickle.loads(payload), filename, footer=footer)
+    return filename, time.perf_counter() - start
+
+def generate_reports(data, base_filename, formats, parallel=True, trace=None, footer=None):
+    """Genera los formatos indicados a partir de los mismos datos.
+
+    Los datos se serializan una sola vez y, con `parallel`, cada formato se
+    genera en su propio proceso. Devuelve (archivos generados, {formato: error});
+    un formato que falla no impide que se escriban los demás. Con `trace` se
+    registra el tiempo, las filas y el error de cada formato.
+    """
+    formats = [fmt for fmt in FORMATS if fmt in formats]
+    payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+    jobs = {fmt: f"{base_filename}{FORMATS[fmt][0]}" for fmt in formats}
+    generated_files, errors = [], {}
+    rows = instrumentation.report_rows(data) if trace else 0
+
+    def finish(fmt, start, result):
+        elapsed = None
+        try:
+            filename, elapsed = result()
+            generated_files.append(filename)
+        except Exception as e: errors[fmt] = str(e)
+        # Si el formato falló no hay tiempo propio: se registra el transcurrido desde `start`
+        if trace: trace.record_renderer(fmt, time.perf_counter() - start if elapsed is None else elapsed, errors.get(fmt), rows)
 
-    wb.save(filename)
\ No newline at end of file
+    if parallel and len(jobs) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            start = time.perf_counter()
+            futures = {pool.submit(_render_format, fmt, payload, filename, footer): fmt for fmt, filename in jobs.items()}
+            for future in concurrent.futures.as_completed(futures):
+                finish(futures[future], start, future.result)
+    else:
+        for fmt, filename in jobs.items():
+            finish(fmt, time.perf_counter(), lambda: _render_format(fmt, payload, filename, footer))
+    return generated_files, errors
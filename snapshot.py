@@ -0,0 +1,120 @@
+# snapshot.py
+
+# Instantáneas en disco de los datos recolectados, por equipo. Permiten volver
+# a recolectar solo las secciones volátiles mientras las estables (BIOS, CPU,
+# RAM, discos...) sigan frescas, y generar un reporte de cambios (delta).
+
+import collections
+import gzip
+import json
+import os
+import socket
+import tempfile
+import time
+
+import collector
+import tabular
+
+SNAPSHOT_DIR = "instantaneas"
+STABLE_SECTIONS = {"system", "bios", "cpu", "ram", "disks", "os"}
+VOLATILE_SECTIONS = {"network", "printers", "software"}
+MAX_AGE = 7 * 24 * 3600 # Segundos que una sección estable se considera fresca
+
+# Campos que identifican una fila de cada lista, para detectar cambios de versión
+ROW_IDENTITY = {
+    "software": ("Nombre", "Vendedor"),
+    "printers": ("Nombre",),
+    "disks": ("Número de Serie",),
+}
+
+def snapshot_path(hostname, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"{hostname}.json.gz")
+
+def load(hostname, snapshot_dir=SNAPSHOT_DIR):
+    """Devuelve {sección: {"collected": timestamp, "data": datos}} o {} si no hay instantánea."""
+    try:
+        with gzip.open(snapshot_path(hostname, snapshot_dir), "rt", encoding="utf-8") as f:
+            return json.load(f, object_hook=tabular.decode)["sections"]
+    except (OSError, EOFError, ValueError, KeyError): # EOFError: gzip truncado
+        return {}
+
+def save(hostname, sections, snapshot_dir=SNAPSHOT_DIR):
+    os.makedirs(snapshot_dir, exist_ok=True)
+    # Se escribe a un temporal propio y se reemplaza, para no dejar una instantánea a medias
+    # aunque el agente y la CLI guarden el mismo equipo a la vez
+    fd, tmp = tempfile.mkstemp(prefix=f"{hostname}.", suffix=".tmp", dir=snapshot_dir)
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            # Las secciones de lista se guardan como tabular.Table: encabezado una vez y filas como listas
+            json.dump({"hostname": hostname, "sections": sections}, f, ensure_ascii=False, separators=(",", ":"), default=tabular.encode)
+        os.replace(tmp, snapshot_path(hostname, snapshot_dir))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def incremental_collect(keys, hostname=None, snapshot_dir=SNAPSHOT_DIR, max_age=MAX_AGE, collect=collector.collect, **collect_options):
+    """Recolecta `keys` reutilizando las secciones estables frescas de la instantánea anterior.
+
+    Devuelve (all_data, datos anteriores, secciones reutilizadas) y guarda la
+    nueva instantánea. Los datos anteriores sirven para `diff`.
+    """
+    hostname = hostname or socket.gethostname()
+    sections = load(hostname, snapshot_dir)
+    previous = {key: entry["data"] for key, entry in sections.items()}
+    now = time.time()
+    reused = [key for key in keys if key in STABLE_SECTIONS and key in sections
+              and now - sections[key]["collected"] < max_age and not collector.has_error(sections[key]["data"])]
+
+    collected = collect([key for key in keys if key not in reused], **collect_options)
+    for key, section_data in collected.items():
+        # Un error no reemplaza a datos válidos anteriores
+        if key not in sections or not collector.has_error(section_data):
+            sections[key] = {"collected": now, "data": section_data}
+    save(hostname, sections, snapshot_dir)
+    return {key: collected[key] if key in collected else sections[key]["data"] for key in keys}, previous, reused
+
+def _row_changes(section, old_rows, new_rows):
+    # Las filas se comparan como tuplas con las columnas de la tabla nueva (una
+    # instantánea antigua puede traer listas de diccionarios)
+    new_table = tabular.as_table(new_rows)
+    old_table = tabular.as_table(old_rows, new_table.columns or None)
+    columns = new_table.columns or old_table.columns
+    # Diferencia de multiconjuntos: O(n) aunque haya miles de programas
+    old_count, new_count = collections.Counter(old_table), collections.Counter(new_table)
+    added = list((new_count - old_count).elements())
+    removed = list((old_count - new_count).elements())
+
+    # Una fila que desaparece y reaparece con la misma identidad es un cambio (p. ej. de versión)
+    identity = [field for field in ROW_IDENTITY.get(section, ()) if field in columns]
+    changed = []
+    if identity:
+        key = tabular.Table(columns).getter(identity, None)
+        removed_by_id = {}
+        for row in removed: removed_by_id.setdefault(key(row), []).append(row)
+        still_added = []
+        for row in added:
+            matches = removed_by_id.get(key(row))
+            if matches: changed.append((matches.pop(), row))
+            else: still_added.append(row)
+        added = still_added
+        removed = [row for rows in removed_by_id.values() for row in rows]
+    as_dict = lambda row: dict(zip(columns, row))
+    return {"added": [as_dict(row) for row in added], "removed": [as_dict(row) for row in removed],
+            "changed": [{"Antes": as_dict(before), "Ahora": as_dict(after)} for before, after in changed]}
+
+def _field_changes(old, new):
+    return {
+        "added": [{k: v} for k, v in new.items() if k not in old],
+        "removed": [{k: v} for k, v in old.items() if k not in new],
+        "changed": [{"Campo": k, "Antes": old[k], "Ahora": v} for k, v in new.items() if k in old and old[k] != v],
+    }
+
+def diff(old, new):
+    """Cambios entre dos `all_data`: {sección: {"added", "removed", "changed"}}, solo las secciones con cambios."""
+    delta = {}
+    for key, new_section in new.items():
+        if key not in old or collector.has_error(new_section) or collector.has_error(old[key]): continue
+        if isinstance(new_section, dict): changes = _field_changes(old[key], new_section)
+        else: changes = _row_changes(key, old[key], new_section)
+        if any(changes.values()): delta[key] = changes
+    return delta
@@ -0,0 +1,153 @@
+# software_inventory.py
+
+# Inventario de programas instalados leyendo las claves "Uninstall" del registro.
+# Es mucho más rápido que Win32_Product y no dispara la verificación de
+# consistencia de Windows Installer sobre cada paquete MSI.
+
+from tabular import Table
+
+HKLM = "HKEY_LOCAL_MACHINE"
+HKCU = "HKEY_CURRENT_USER"
+
+UNINSTALL_PATH = "SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Uninstall"
+
+# (hive, vista) a recorrer: 64 y 32 bits de HKLM, y HKCU
+UNINSTALL_SOURCES = [(HKLM, 64), (HKLM, 32), (HKCU, None)]
+
+# Columnas de la tabla de programas (tabular.Table), compartidas con Win32_Product
+SOFTWARE_COLUMNS = ("Nombre", "Versión", "Vendedor")
+
+MISSING = "N/A" # Versión o editor ausentes en la entrada del registro
+
+# Entradas que no son programas: actualizaciones y parches
+SKIPPED_RELEASE_TYPES = {"Update", "Hotfix", "Security Update"}
+
+# Valores de cada entrada Uninstall que usa el inventario
+INVENTORY_VALUES = {"DisplayName", "DisplayVersion", "Publisher", "SystemComponent", "ParentKeyName", "ReleaseType"}
+
+ERROR_FILE_NOT_FOUND = 2
+
+class RegistryReader:
+    """Interfaz mínima de lectura del registro que usa el inventario.
+
+    Una clave inexistente se lee como vacía; cualquier otro error (acceso
+    denegado, equipo remoto sin servicio de registro) se propaga como OSError
+    para que la sección quede con error en lugar de vacía.
+    """
+    def subkeys(self, hive, path, view=None):
+        """Devuelve los nombres de las subclaves de `path` (lista vacía si no existe)."""
+        raise NotImplementedError
+
+    def values(self, hive, path, view=None):
+        """Devuelve un diccionario {nombre: valor} con los valores de `path` (vacío si no existe)."""
+        raise NotImplementedError
+
+class WinregReader(RegistryReader):
+    """Lector basado en winreg; `computer` permite leer el registro de un equipo remoto."""
+    def __init__(self, computer=None):
+        import winreg
+        self.winreg = winreg
+        self.computer = computer
+        self._roots = {}
+
+    def _open(self, hive, path, view):
+        winreg = self.winreg
+        if hive not in self._roots:
+            self._roots[hive] = winreg.ConnectRegistry(self.computer, getattr(winreg, hive))
+        access = winreg.KEY_READ
+        if view == 64: access |= winreg.KEY_WOW64_64KEY
+        elif view == 32: access |= winreg.KEY_WOW64_32KEY
+        try:
+            return winreg.OpenKey(self._roots[hive], path, 0, access)
+        except OSError as e:
+            if getattr(e, "winerror", None) == ERROR_FILE_NOT_FOUND: return None
+            raise
+
+    def subkeys(self, hive, path, view=None):
+        key = self._open(hive, path, view)
+        if key is None: return []
+        with key:
+            return [self.winreg.EnumKey(key, i) for i in range(self.winreg.QueryInfoKey(key)[0])]
+
+    def values(self, hive, path, view=None):
+        key = self._open(hive, path, view)
+        if key is None: return {}
+        with key:
+            return {name: value for name, value, _ in (self.winreg.EnumValue(key, i) for i in range(self.winreg.QueryInfoKey(key)[1]))}
+
+# Namespace de StdRegProv y sus claves raíz (hDefKey)
+REGISTRY_NAMESPACE = "root\\default"
+STDREGPROV_HIVES = {HKCU: 0x80000001, HKLM: 0x80000002}
+REG_SZ, REG_EXPAND_SZ, REG_DWORD = 1, 2, 4
+
+class WmiRegistryReader(RegistryReader):
+    """Lector sobre StdRegProv de una conexión WMI a REGISTRY_NAMESPACE, con las mismas credenciales que el resto del reporte.
+
+    La vista de 32 bits de HKLM se lee en WOW6432Node. HKCU sería el perfil del
+    usuario de la conexión, no el del equipo, así que se omite. Solo se leen los
+    valores de INVENTORY_VALUES.
+    """
+    def __init__(self, connection):
+        self.registry = connection.StdRegProv
+
+    @staticmethod
+    def _key(hive, path, view):
+        if view == 32 and path.upper().startswith("SOFTWARE\\"): path = "SOFTWARE\\WOW6432Node\\" + path[len("SOFTWARE\\"):]
+        return STDREGPROV_HIVES[hive], path
+
+    @staticmethod
+    def _found(method, result, path):
+        if result not in (0, ERROR_FILE_NOT_FOUND): raise OSError(f"StdRegProv.{method} devolvió el código {result} en {path}")
+        return result == 0
+
+    def subkeys(self, hive, path, view=None):
+        if hive == HKCU: return []
+        hdefkey, path = self._key(hive, path, view)
+        result, names = self.registry.EnumKey(hDefKey=hdefkey, sSubKeyName=path)
+        return list(names or []) if self._found("EnumKey", result, path) else []
+
+    def values(self, hive, path, view=None):
+        if hive == HKCU: return {}
+        hdefkey, path = self._key(hive, path, view)
+        result, names, types = self.registry.EnumValues(hDefKey=hdefkey, sSubKeyName=path)
+        if not self._found("EnumValues", result, path): return {}
+        values = {}
+        for name, value_type in zip(names or [], types or []):
+            if name not in INVENTORY_VALUES: continue
+            if value_type in (REG_SZ, REG_EXPAND_SZ): method = "GetStringValue"
+            elif value_type == REG_DWORD: method = "GetDWORDValue"
+            else: continue
+            result, value = getattr(self.registry, method)(hDefKey=hdefkey, sSubKeyName=path, sValueName=name)
+            if self._found(method, result, path): values[name] = value
+        return values
+
+class DictRegistryReader(RegistryReader):
+    """Registro en memoria para pruebas y benchmarks.
+
+    `tree` tiene la forma {(hive, vista): {ruta: {subclave: {nombre: valor}}}}.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+
+    def subkeys(self, hive, path, view=None):
+        return list(self.tree.get((hive, view), {}).get(path, {}))
+
+    def values(self, hive, path, view=None):
+        parent, _, name = path.rpartition("\\")
+        return dict(self.tree.get((hive, view), {}).get(parent, {}).get(name, {}))
+
+def _is_program(values):
+    if not values.get("DisplayName"): return False
+    if values.get("SystemComponent") == 1 or values.get("ParentKeyName"): return False
+    return values.get("ReleaseType") not in SKIPPED_RELEASE_TYPES
+
+def read_installed_software(reader, sources=UNINSTALL_SOURCES):
+    """Devuelve una Table de SOFTWARE_COLUMNS sin duplicados, ordenada por nombre."""
+    seen = set()
+    for hive, view in sources:
+        for subkey in reader.subkeys(hive, UNINSTALL_PATH, view):
+            values = reader.values(hive, f"{UNINSTALL_PATH}\\{subkey}", view)
+            if not _is_program(values): continue
+            # El mismo programa suele aparecer en ambas vistas de HKLM. Muchas entradas no tienen versión o editor
+            seen.add((values["DisplayName"].strip(), values.get("DisplayVersion") or MISSING, values.get("Publisher") or MISSING))
+    return Table(SOFTWARE_COLUMNS, sorted(seen, key=lambda x: (x[0], str(x[1]), str(x[2]))))
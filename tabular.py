@@ -0,0 +1,87 @@
+# tabular.py
+
+# Representación compacta de las secciones de lista (discos, impresoras,
+# programas): un encabezado compartido y una tupla por fila, en lugar de un
+# diccionario con las mismas claves repetidas en cada fila. Los errores de una
+# sección siguen siendo [{"Error": mensaje}].
+
+import operator
+
+class Table:
+    """Filas con un esquema compartido: `columns` (nombres) y `rows` (tuplas en ese orden).
+
+    Se comporta como una secuencia de filas: len, iteración (tuplas),
+    índices y cortes (devuelven otra Table).
+    """
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns, rows=()):
+        self.columns = tuple(columns)
+        self.rows = [tuple(row) for row in rows]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice): return Table(self.columns, self.rows[index])
+        return self.rows[index]
+
+    def __eq__(self, other):
+        return isinstance(other, Table) and self.columns == other.columns and self.rows == other.rows
+
+    def __repr__(self):
+        return f"Table({list(self.columns)!r}, {len(self.rows)} filas)"
+
+    def append(self, row):
+        self.rows.append(tuple(row))
+
+    def getter(self, columns, default="N/A"):
+        """Función fila -> tupla con `columns` en ese orden, resuelta una sola vez para toda la tabla.
+
+        Las columnas que la tabla no tiene valen `default`.
+        """
+        positions = [self.columns.index(column) if column in self.columns else None for column in columns]
+        if None not in positions:
+            if len(positions) == 1: return lambda row, position=positions[0]: (row[position],)
+            return operator.itemgetter(*positions)
+        return lambda row: tuple(default if position is None else row[position] for position in positions)
+
+    def dicts(self):
+        """Las filas como diccionarios {columna: valor} (para JSON legible o comparaciones campo a campo)."""
+        columns = self.columns
+        return [dict(zip(columns, row)) for row in self.rows]
+
+    def to_json(self):
+        return {"columns": list(self.columns), "rows": [list(row) for row in self.rows]}
+
+def is_error(section_data):
+    """True si la sección de lista es un error ([{"Error": ...}])."""
+    return isinstance(section_data, list) and bool(section_data) and isinstance(section_data[0], dict) and "Error" in section_data[0]
+
+def as_table(section_data, columns=None, default=None):
+    """Devuelve `section_data` como Table, con `columns` en ese orden si se indican.
+
+    Acepta una Table, una lista de diccionarios (p. ej. de una instantánea
+    antigua) o la forma JSON de `Table.to_json`. Las columnas que faltan valen
+    `default` (los generadores de reportes usan "N/A").
+    """
+    if isinstance(section_data, dict):
+        section_data = Table(section_data["columns"], section_data["rows"])
+    if isinstance(section_data, Table):
+        if columns is None or tuple(columns) == section_data.columns: return section_data
+        return Table(columns, map(section_data.getter(columns, default), section_data.rows))
+    if columns is None: columns = list(section_data[0]) if section_data else []
+    return Table(columns, (tuple(row.get(column, default) for column in columns) for row in section_data))
+
+def encode(obj):
+    """Función `default` para json.dump: serializa las Table con Table.to_json."""
+    if isinstance(obj, Table): return obj.to_json()
+    raise TypeError(f"{type(obj).__name__} no es serializable a JSON")
+
+def decode(obj):
+    """`object_hook` para json.load: convierte de vuelta las tablas serializadas con `encode`."""
+    if obj.keys() == {"columns", "rows"}: return Table(obj["columns"], obj["rows"])
+    return obj
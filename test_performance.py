@@ -0,0 +1,278 @@
+# test_performance.py
+
+# Comprobaciones rápidas de las optimizaciones sobre el WMI simulado; se
+# ejecutan en cualquier sistema operativo con `python -m unittest test_performance`.
+# Las mediciones de tiempo y memoria siguen en benchmark.py.
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import collections
+import unittest
+import urllib.error
+import urllib.request
+
+import InfoSystem_backend as backend
+import agent
+import collector
+import fleet
+import instrumentation
+import report_generator
+import snapshot
+import software_inventory
+import wmi_cache
+import wmi_pool
+import wmi_simulator
+
+class QueryCacheTest(unittest.TestCase):
+    def test_full_report_queries_each_class_once(self):
+        traffic = wmi_simulator.Traffic()
+        cache = wmi_cache.QueryCache()
+        collector.collect(list(collector.COLLECTORS), wmi_simulator.connection_factory(traffic=traffic), cache=cache, software_source="wmi")
+        self.assertTrue(traffic.queries)
+        self.assertEqual({wmi_class: 1 for wmi_class in traffic.queries}, dict(traffic.queries))
+        self.assertGreater(cache.hits, 0)
+
+class ConnectionPoolTest(unittest.TestCase):
+    def test_reports_share_one_connection_per_namespace(self):
+        opened = collections.Counter()
+        pool = wmi_pool.ConnectionPool(wmi_simulator.pool_factory(opened))
+        for _ in range(3):
+            collector.collect(list(collector.COLLECTORS), pool.factory_for(), max_workers=len(collector.COLLECTORS), software_source="wmi")
+        self.assertEqual({None: 1, wmi_simulator.STORAGE_NAMESPACE: 1}, dict(opened))
+
+    def test_failed_health_check_reopens_connection(self):
+        opened = collections.Counter()
+        def health_check(connection): raise ConnectionError("RPC no disponible")
+        pool = wmi_pool.ConnectionPool(wmi_simulator.pool_factory(opened), health_check=health_check, health_interval=0)
+        first = pool.get()
+        self.assertIsNot(first, pool.get())
+        self.assertEqual(2, opened[None])
+
+    def test_broken_connection_is_evicted_before_the_next_health_check(self):
+        opened = collections.Counter()
+        pool = wmi_pool.ConnectionPool(wmi_simulator.pool_factory(opened))
+        def rpc_unavailable(wql): raise ConnectionError("El servidor RPC no está disponible")
+        pool.get().query = rpc_unavailable
+        self.assertTrue(collector.has_error(collector.collect(["cpu"], pool.factory_for())["cpu"]))
+        self.assertFalse(collector.has_error(collector.collect(["cpu"], pool.factory_for())["cpu"]))
+        self.assertEqual(2, opened[None])
+
+    def test_query_errors_keep_the_connection(self):
+        pool = wmi_pool.ConnectionPool(wmi_simulator.pool_factory())
+        connection = pool.get()
+        with self.assertRaises(ValueError): pool.factory_for()().query("no es WQL")
+        self.assertIs(connection, pool.get())
+
+class DeadlineTest(unittest.TestCase):
+    """Colectores falsos que se cuelgan hasta `release` (se libera al terminar cada prueba)."""
+    def setUp(self):
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        hang = lambda c: self.release.wait(30)
+        self.collectors = dict(collector.software_collectors("wmi"), printers=hang, software=hang)
+        self.factory = wmi_simulator.connection_factory()
+
+    def test_hung_sections_are_abandoned_at_their_deadline(self):
+        trace = instrumentation.Trace()
+        start = time.perf_counter()
+        data = collector.collect(list(collector.COLLECTORS), self.factory, collectors=self.collectors, trace=trace,
+                                 timeouts={"printers": 0.1, "software": 0.2})
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(["printers", "software"], collector.incomplete_sections(data))
+        self.assertIsInstance(data["software"], list)
+        self.assertIn("cpu", data)
+        self.assertTrue(trace.collectors["software"]["exceptions"][0].startswith(collector.INCOMPLETE))
+
+    def test_cancel_abandons_running_and_queued_sections(self):
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+        keys = ["software", "cpu", "bios"]
+        start = time.perf_counter()
+        # Con un solo hilo, cpu y bios siguen en cola detrás de software cuando se cancela
+        data = collector.collect(keys, self.factory, max_workers=1, collectors=self.collectors, timeouts={"software": None}, cancel=cancel)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(keys, collector.incomplete_sections(data))
+
+    def test_partial_report_marks_incomplete_sections(self):
+        data = collector.collect(["cpu", "printers"], self.factory, collectors=self.collectors, timeouts={"printers": 0.1})
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "parcial.html")
+            report_generator.generate_html(data, filename)
+            with open(filename, encoding="utf-8") as f: html = f.read()
+        self.assertIn(collector.INCOMPLETE, html)
+        self.assertIn("Procesador (CPU)", html)
+
+class SoftwareInventoryTest(unittest.TestCase):
+    def test_registry_entries_are_filtered_deduplicated_and_sorted(self):
+        uninstall = software_inventory.UNINSTALL_PATH
+        shared = {"DisplayName": "Editor de texto ", "DisplayVersion": "2.1", "Publisher": "Contoso"}
+        reader = software_inventory.DictRegistryReader({
+            (software_inventory.HKLM, 64): {uninstall: {
+                "{A}": shared,
+                "{B}": {"DisplayName": "Controlador interno", "SystemComponent": 1},
+                "KB5001": {"DisplayName": "Actualización KB5001", "ReleaseType": "Update"},
+                "{C}": {"DisplayName": "Cliente de correo"},
+                "{D}": {"DisplayVersion": "1.0"},
+            }},
+            (software_inventory.HKLM, 32): {uninstall: {"{A}": shared, "{E}": {"DisplayName": "Antivirus", "Publisher": "Fabrikam"}}},
+        })
+        software = backend.get_installed_software(None, source="registry", reader=reader)
+        self.assertEqual(software_inventory.SOFTWARE_COLUMNS, software.columns)
+        self.assertEqual([("Antivirus", "N/A", "Fabrikam"), ("Cliente de correo", "N/A", "N/A"), ("Editor de texto", "2.1", "Contoso")],
+                         software.rows)
+
+class SnapshotTest(unittest.TestCase):
+    def test_concurrent_saves_leave_a_complete_snapshot(self):
+        sections = {"software": {"collected": 0, "data": software_inventory.read_installed_software(wmi_simulator.registry(3000))}}
+        with tempfile.TemporaryDirectory() as tmp:
+            # Como el agente y `InfoSystem_cli --incremental` guardando el mismo equipo
+            writers = [threading.Thread(target=snapshot.save, args=("pc-1", sections, tmp)) for _ in range(4)]
+            for writer in writers: writer.start()
+            for writer in writers: writer.join()
+            self.assertEqual(sections, snapshot.load("pc-1", tmp))
+            self.assertEqual(["pc-1.json.gz"], os.listdir(tmp))
+
+    def test_truncated_snapshot_loads_as_missing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot.save("pc-1", {"cpu": {"collected": 0, "data": {"Procesador": "x" * 1000}}}, tmp)
+            path = snapshot.snapshot_path("pc-1", tmp)
+            with open(path, "rb") as f: content = f.read()
+            with open(path, "wb") as f: f.write(content[:len(content) // 2])
+            self.assertEqual({}, snapshot.load("pc-1", tmp))
+
+class AgentTest(unittest.TestCase):
+    """Agente con colectores simulados y reloj falso: el refresco escalonado se comprueba sin esperar horas."""
+    def setUp(self):
+        self.now = 0.0
+        self.failing = set()
+        def failing(key, function):
+            def run(c):
+                if key in self.failing: raise ConnectionError("El servidor RPC no está disponible")
+                return function(c)
+            return run
+        collectors = {key: failing(key, function) for key, function in collector.software_collectors("wmi").items()}
+        self.agent = agent.Agent(connection_factory=wmi_simulator.connection_factory(), collectors=collectors, clock=lambda: self.now)
+
+    def test_sections_refresh_on_their_own_schedule(self):
+        keys = list(collector.COLLECTORS)
+        self.assertEqual(keys, self.agent.run_pending())
+        self.assertTrue(self.agent.ready.is_set())
+        self.now = 6 * 60
+        self.assertEqual(["network", "printers"], self.agent.run_pending())
+        self.assertEqual([], self.agent.run_pending())
+        self.now = 25 * 3600
+        self.assertEqual(keys, self.agent.run_pending())
+
+    def test_failed_refresh_keeps_previous_data_and_retries_sooner(self):
+        self.agent.run_pending()
+        printers = self.agent.data["printers"]
+        self.failing.add("printers")
+        self.now = 6 * 60
+        self.agent.run_pending()
+        self.assertIs(printers, self.agent.data["printers"])
+        self.assertEqual(0, self.agent.collected["printers"])
+        self.assertEqual(self.now + agent.RETRY_INTERVAL, self.agent.next_refresh["printers"])
+        self.assertFalse(self.agent.status()["sections"]["printers"]["error"])
+
+    def test_http_round_trip(self):
+        self.agent.run_pending()
+        server = agent.AgentServer(self.agent, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://{agent.HOST}:{server.server_address[1]}"
+
+        data = agent.fetch_data(url, ["cpu", "software"])
+        self.assertEqual(["cpu", "software"], list(data))
+        self.assertEqual(self.agent.data["software"], data["software"])
+
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            agent.fetch_data(url, ["cpu", "bateria"])
+        self.assertEqual(400, raised.exception.code)
+
+        self.failing.add("software")
+        urllib.request.urlopen(urllib.request.Request(f"{url}/refresh?sections=software", method="POST")).close()
+        self.assertEqual(data["software"], agent.fetch_data(url, ["software"])["software"])
+
+class DeniedRegistryReader(software_inventory.RegistryReader):
+    """Registro que no se puede abrir, como un equipo sin servicio de registro remoto o sin permisos."""
+    def subkeys(self, hive, path, view=None):
+        raise PermissionError("Acceso denegado")
+
+    values = subkeys
+
+class RemoteSoftwareTest(unittest.TestCase):
+    def test_unreadable_registry_is_an_error_not_an_empty_list(self):
+        software = backend.get_installed_software(None, source="registry", reader=DeniedRegistryReader())
+        self.assertTrue(collector.has_error(software))
+        self.assertIn("Acceso denegado", software[0]["Error"])
+
+    def test_fleet_reads_registry_over_the_wmi_connection(self):
+        hosts = wmi_simulator.host_factory(registry=wmi_simulator.registry(30))
+        data, _ = fleet.collect_host("pc-1", ["software"], host_factory=hosts)
+        # HKCU remoto es el perfil de la conexión: solo cuentan las dos vistas de HKLM
+        expected = software_inventory.read_installed_software(wmi_simulator.registry(30), software_inventory.UNINSTALL_SOURCES[:2])
+        self.assertEqual(expected, data["software"])
+        self.assertLess(len(expected), len(software_inventory.read_installed_software(wmi_simulator.registry(30))))
+
+    def test_fleet_reports_denied_registry(self):
+        hosts = wmi_simulator.host_factory(registry=wmi_simulator.registry(30), registry_result=5)
+        data, _ = fleet.collect_host("pc-1", ["software"], host_factory=hosts)
+        self.assertTrue(collector.has_error(data["software"]))
+        data, _ = fleet.collect_host("pc-1", ["software"], host_factory=wmi_simulator.host_factory(), registry_factory=lambda host: DeniedRegistryReader())
+        self.assertTrue(collector.has_error(data["software"]))
+
+class TraceTest(unittest.TestCase):
+    def test_renderers_record_their_input_rows(self):
+        data = {"cpu": {"Procesador": "Intel", "Núcleos Físicos": 8}, "software": software_inventory.read_installed_software(wmi_simulator.registry(30))}
+        trace = instrumentation.Trace()
+        with tempfile.TemporaryDirectory() as tmp:
+            report_generator.generate_reports(data, os.path.join(tmp, "reporte"), ["HTML"], parallel=False, trace=trace)
+        self.assertEqual(2 + len(data["software"]), trace.renderers["HTML"]["rows"])
+        self.assertIsNone(trace.renderers["HTML"]["error"])
+
+class ListSectionTest(unittest.TestCase):
+    # Filas como diccionarios (instantáneas antiguas, llamadores externos) a las que les falta una columna
+    DATA = {"software": [{"Nombre": "Programa A", "Versión": "1.0", "Vendedor": "Contoso"}, {"Nombre": "Programa B"}]}
+
+    def test_missing_columns_render_as_not_available(self):
+        out = io.StringIO()
+        report_generator.render_html(self.DATA, out)
+        self.assertIn("<tr><td>Programa B</td><td>N/A</td><td>N/A</td></tr>", out.getvalue())
+        self.assertNotIn("None", out.getvalue())
+
+    def test_missing_columns_in_excel(self):
+        import openpyxl
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "filas.xlsx")
+            report_generator.generate_excel(self.DATA, filename)
+            rows = list(openpyxl.load_workbook(filename)["Software"].values)
+        self.assertEqual(("Programa B", "N/A", "N/A"), rows[2])
+
+HEAVY_MODULES = ("reportlab", "openpyxl", "tkinter")
+
+def cli_heavy_modules(formats):
+    """Ejecuta la CLI en un proceso nuevo sobre WMI simulado y devuelve los módulos pesados que cargó."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        code = ("import sys, InfoSystem_cli, wmi_simulator; "
+                f"InfoSystem_cli.main(['-f', {', '.join(repr(f) for f in formats)}, '-o', {tmp!r}, '--software-source', 'wmi', '--serial'], wmi_simulator.connection_factory()); "
+                f"print('pesados:', *sorted({{name.split('.')[0] for name in sys.modules}} & set({HEAVY_MODULES!r})))")
+        result = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True, check=True)
+    # La CLI también imprime los archivos generados
+    return result.stdout.splitlines()[-1].split()[1:]
+
+class LazyImportTest(unittest.TestCase):
+    def test_html_report_skips_heavy_modules(self):
+        self.assertEqual([], cli_heavy_modules(["html"]))
+
+    def test_pdf_and_excel_load_their_libraries(self):
+        self.assertEqual(["openpyxl", "reportlab"], cli_heavy_modules(["pdf", "excel"]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# wmi_cache.py
+
+import threading
+import time
+
+import instrumentation
+
+class QueryCache:
+    """Caché de consultas WMI compartida entre los hilos de un reporte.
+
+    Las consultas idénticas (misma clase, mismos filtros, mismo namespace) se
+    responden desde memoria durante la vida del objeto o, si se indica `ttl`,
+    durante `ttl` segundos. `hits` y `misses` cuentan los aciertos y fallos.
+    """
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, fetch):
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        # Un solo hilo consulta WMI por clave; los demás esperan su resultado
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry and (self.ttl is None or time.monotonic() - entry[0] < self.ttl):
+                with self._lock: self.hits += 1
+                return entry[1]
+            with self._lock: self.misses += 1
+            value = fetch()
+            self._entries[key] = (time.monotonic(), value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._locks.clear()
+
+class CachedConnection:
+    """Envuelve una conexión WMI; `c.Win32_X(**filtros)` pasa por la caché."""
+    def __init__(self, connection, cache, namespace=None):
+        self._connection = connection
+        self._cache = cache
+        self._namespace = namespace
+
+    def __getattr__(self, name):
+        # La clase WMI solo se resuelve en un fallo de caché, ya que resolverla también es una llamada COM
+        def cached_call(*args, **kwargs):
+            key = (self._namespace, name, args, tuple(sorted(kwargs.items())))
+            def fetch():
+                # Solo los fallos llegan a WMI: los aciertos no cuentan como consultas en la traza
+                instrumentation.record_query()
+                return getattr(self._connection, name)(*args, **kwargs)
+            return self._cache.get(key, fetch)
+        return cached_call
+
+def cached_factory(connection_factory, cache):
+    """Devuelve una fábrica de conexiones cuyas conexiones comparten `cache`."""
+    def connect(namespace=None):
+        connection = connection_factory(namespace=namespace) if namespace else connection_factory()
+        return CachedConnection(connection, cache, namespace)
+    return connect
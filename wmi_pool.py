@@ -0,0 +1,148 @@
+# wmi_pool.py
+
+import threading
+import time
+
+HEALTH_INTERVAL = 30 # Segundos entre comprobaciones de una conexión reutilizada
+
+class ComApartment:
+    """Inicializa COM en el hilo actual; no hace nada si pythoncom no existe."""
+    def __enter__(self):
+        try:
+            import pythoncom
+        except ImportError:
+            self.pythoncom = None
+            return self
+        self.pythoncom = pythoncom
+        # MTA: los objetos COM se pueden usar desde cualquier hilo del pool
+        pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+        return self
+
+    def __exit__(self, *exc):
+        if self.pythoncom: self.pythoncom.CoUninitialize()
+
+def wmi_factory(host=None, namespace=None, user=None, password=None):
+    """Abre una conexión WMI local (host=None) o remota (importa wmi solo cuando se necesita)."""
+    import wmi
+    options = {"computer": host, "user": user, "password": password} if host else {}
+    if namespace: options["namespace"] = namespace
+    return wmi.WMI(**options)
+
+def check_connection(connection):
+    # __NAMESPACE existe en todos los namespaces y la consulta es trivial
+    connection.query("SELECT Name FROM __NAMESPACE")
+
+# HRESULT de una conexión rota: servidor RPC no disponible, llamada RPC fallida, objeto COM desconectado
+BROKEN_HRESULTS = {-2147023174, -2147023170, -2147417848}
+
+def is_broken_connection(error):
+    """True si `error` indica que la conexión ya no sirve, y no un fallo de la consulta en sí."""
+    if isinstance(error, ConnectionError): return True
+    # wmi.x_wmi envuelve el pywintypes.com_error original
+    com_error = getattr(error, "com_error", None) or error
+    return getattr(com_error, "hresult", None) in BROKEN_HRESULTS
+
+class _Guarded:
+    """Envuelve una conexión prestada (y lo que se obtiene de ella): una llamada que falla por conexión rota la descarta del pool."""
+    def __init__(self, target, on_broken):
+        self._target = target
+        self._on_broken = on_broken
+
+    def __call__(self, *args, **kwargs):
+        try:
+            return self._target(*args, **kwargs)
+        except Exception as e:
+            if is_broken_connection(e): self._on_broken()
+            raise
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        return _Guarded(value, self._on_broken) if callable(value) else value
+
+class ConnectionPool:
+    """Conexiones WMI compartidas, una por (host, namespace).
+
+    Los colectores piden la conexión con `get` (o con la fábrica de `factory_for`)
+    y la comparten: las conexiones se abren en hilos MTA y se pueden usar desde
+    cualquier hilo del pool de colectores. Una conexión reutilizada se comprueba
+    con `health_check` como mucho cada `health_interval` segundos y, si falla, se
+    descarta y se abre otra. `opened` cuenta las conexiones abiertas por clave.
+    """
+    def __init__(self, factory=wmi_factory, health_check=check_connection, health_interval=HEALTH_INTERVAL):
+        self.factory = factory
+        self.health_check = health_check
+        self.health_interval = health_interval
+        self.opened = {}
+        self._connections = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+        self._mta = None
+
+    def _keep_mta_alive(self):
+        # Los objetos COM de un MTA dejan de ser válidos cuando el último hilo MTA
+        # termina; este hilo mantiene el MTA vivo para reutilizar las conexiones entre reportes.
+        if self._mta: return
+        started, self._mta = threading.Event(), threading.Event()
+        def keeper():
+            with ComApartment():
+                started.set()
+                self._mta.wait()
+        threading.Thread(target=keeper, daemon=True, name="wmi-pool-mta").start()
+        started.wait()
+
+    def get(self, namespace=None, host=None):
+        """Devuelve una conexión sana para (host, namespace), abriéndola si hace falta."""
+        key = (host, namespace)
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+            self._keep_mta_alive()
+        with key_lock:
+            entry = self._connections.get(key)
+            if entry and time.monotonic() - entry[1] >= self.health_interval:
+                try:
+                    self.health_check(entry[0])
+                    entry[1] = time.monotonic()
+                except Exception:
+                    entry = None
+            if entry is None:
+                with ComApartment():
+                    connection = self.factory(host=host, namespace=namespace)
+                entry = self._connections[key] = [connection, time.monotonic()]
+                with self._lock: self.opened[key] = self.opened.get(key, 0) + 1
+            return entry[0]
+
+    def factory_for(self, host=None):
+        """Fábrica connect(namespace=None) para collector.collect que toma las conexiones del pool.
+
+        Si una llamada sobre la conexión falla con un error de conexión rota
+        (`is_broken_connection`), la conexión se descarta en el acto, sin esperar
+        a la próxima comprobación.
+        """
+        def connect(namespace=None):
+            connection = self.get(namespace, host)
+            return _Guarded(connection, lambda: self.evict(namespace, host, connection))
+        return connect
+
+    def evict(self, namespace=None, host=None, connection=None):
+        """Descarta la conexión de (host, namespace); la próxima petición abre otra.
+
+        Con `connection`, solo si sigue siendo la del pool (otro hilo puede haberla reemplazado ya).
+        """
+        with self._lock:
+            entry = self._connections.get((host, namespace))
+            if entry and (connection is None or entry[0] is connection): del self._connections[(host, namespace)]
+
+    def close(self, host=None):
+        """Descarta todas las conexiones de un host (p. ej. al terminar con un equipo de la flota)."""
+        with self._lock:
+            for key in [key for key in self._connections if key[0] == host]:
+                del self._connections[key]
+                self._locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._connections.clear()
+            self._locks.clear()
+
+# Pool del proceso: los reportes sucesivos reutilizan las mismas conexiones locales
+default_pool = ConnectionPool()
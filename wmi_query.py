@@ -0,0 +1,19 @@
+# wmi_query.py
+
+from collections import namedtuple
+from types import SimpleNamespace
+
+class WQLQuery(namedtuple("WQLQuery", ["wmi_class", "fields", "where"], defaults=[None])):
+    """Consulta WQL con proyección: solo se piden a WMI los campos que usa el colector."""
+    @property
+    def wql(self):
+        wql = f"SELECT {', '.join(self.fields)} FROM {self.wmi_class}"
+        return f"{wql} WHERE {self.where}" if self.where else wql
+
+def records(c, query):
+    """Ejecuta `query` y lee todos sus campos en una sola pasada.
+
+    Devuelve registros simples (SimpleNamespace) que ya no hacen llamadas COM al
+    leer sus atributos.
+    """
+    return [SimpleNamespace(**{field: getattr(obj, field) for field in query.fields}) for obj in c.query(query.wql)]
@@ -0,0 +1,206 @@
+# wmi_simulator.py
+
+import collections
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import software_inventory
+
+# Proveedor WMI simulado para medir el backend fuera de Windows.
+# Expone las mismas clases que consulta InfoSystem_backend, con cantidades de
+# objetos y latencia por consulta configurables, y un registro en memoria para
+# el inventario de software.
+
+STORAGE_NAMESPACE = "ROOT\\Microsoft\\Windows\\Storage"
+
+def _objects(wmi_class, software=50, printers=5, disks=2, adapters=2, modules=2):
+    if wmi_class == "Win32_ComputerSystem":
+        return [SimpleNamespace(Manufacturer="Contoso", Model="Workstation 5000", Domain="CONTOSO", Workgroup=None, PartOfDomain=True, TotalPhysicalMemory=str(16 * 1024**3))]
+    if wmi_class == "Win32_BIOS":
+        return [SimpleNamespace(Manufacturer="Contoso BIOS", Version="1.2.3", SerialNumber="SN-0001")]
+    if wmi_class == "Win32_OperatingSystem":
+        return [SimpleNamespace(Caption="Microsoft Windows 11 Pro", Version="10.0.22631", OSArchitecture="64 bits")]
+    if wmi_class == "Win32_NetworkAdapterConfiguration":
+        kinds = ["Intel Gigabit Ethernet", "Wi-Fi 6 Wireless", "Hyper-V Virtual Adapter"]
+        return [SimpleNamespace(Description=f"{kinds[i % 3]} #{i}", IPAddress=(f"10.0.{i}.10",)) for i in range(adapters)]
+    if wmi_class == "Win32_PhysicalMemory":
+        return [SimpleNamespace(Speed=3200) for i in range(modules)]
+    if wmi_class == "Win32_Processor":
+        return [SimpleNamespace(Name="Intel(R) Core(TM) i7-12700 CPU @ 2.10GHz", Manufacturer="GenuineIntel", NumberOfCores=12, NumberOfLogicalProcessors=20, MaxClockSpeed=2100)]
+    if wmi_class == "MSFT_PhysicalDisk":
+        return [SimpleNamespace(Manufacturer=f"Disco {i}", Size=str(512 * 1024**3), SerialNumber=f"  DSK-{i:04d}  ") for i in range(disks)]
+    if wmi_class == "Win32_DiskDrive":
+        return [SimpleNamespace(Model=f"Disco {i}", Size=str(512 * 1024**3), SerialNumber=f"DSK-{i:04d}") for i in range(disks)]
+    if wmi_class == "Win32_Product":
+        return [SimpleNamespace(Name=f"Programa {i:05d}", Version=f"{i % 10}.{i % 7}.{i}", Vendor=f"Proveedor {i % 40}") for i in range(software)]
+    if wmi_class == "Win32_Printer":
+        return [SimpleNamespace(Name=f"Impresora {i}", DriverName="Generic PCL", PortName=f"IP_10.0.1.{i}", Default=i == 0) for i in range(printers)]
+    raise AttributeError(wmi_class)
+
+# Número aproximado de propiedades de cada clase: un SELECT * devuelve objetos con
+# las propiedades simuladas completadas hasta esta cantidad
+CLASS_PROPERTIES = {
+    "Win32_ComputerSystem": 66, "Win32_BIOS": 31, "Win32_OperatingSystem": 64, "Win32_NetworkAdapterConfiguration": 74,
+    "Win32_PhysicalMemory": 36, "Win32_Processor": 57, "MSFT_PhysicalDisk": 41, "Win32_DiskDrive": 51,
+    "Win32_Product": 29, "Win32_Printer": 86,
+}
+
+WQL_PATTERN = re.compile(r"SELECT\s+(.+?)\s+FROM\s+(\w+)(?:\s+WHERE\s+.+)?$", re.IGNORECASE)
+
+class Traffic:
+    """Contadores compartidos por las conexiones simuladas, por clase: consultas, propiedades transferidas y propiedades leídas."""
+    def __init__(self):
+        self.queries = collections.Counter()
+        self.properties = collections.Counter()
+        self.fetches = collections.Counter()
+        self.lock = threading.Lock()
+
+    def record(self, wmi_class, properties):
+        with self.lock:
+            self.queries[wmi_class] += 1
+            self.properties[wmi_class] += properties
+
+    def fetch(self, wmi_class):
+        with self.lock: self.fetches[wmi_class] += 1
+
+class SimulatedObject:
+    """Objeto WMI falso: cada lectura de una propiedad cuenta en `Traffic.fetches`, como una llamada COM."""
+    def __init__(self, wmi_class, properties, traffic):
+        self._wmi_class = wmi_class
+        self._properties = properties
+        self._traffic = traffic
+
+    def __getattr__(self, name):
+        if name.startswith("_"): raise AttributeError(name)
+        try:
+            value = self._properties[name]
+        except KeyError:
+            raise AttributeError(f"{self._wmi_class} no tiene la propiedad {name}") from None
+        self._traffic.fetch(self._wmi_class)
+        return value
+
+class SimulatedStdRegProv:
+    """StdRegProv falso sobre un DictRegistryReader; con `result` distinto de 0 todas las llamadas devuelven ese código (5 = acceso denegado)."""
+    HIVES = {code: hive for hive, code in software_inventory.STDREGPROV_HIVES.items()}
+
+    def __init__(self, reader, result=0):
+        self.reader = reader
+        self.result = result
+
+    def _key(self, hDefKey, sSubKeyName):
+        hive = self.HIVES[hDefKey]
+        if "\\WOW6432Node\\" in sSubKeyName: return hive, sSubKeyName.replace("WOW6432Node\\", "", 1), 32
+        return hive, sSubKeyName, 64 if hive == software_inventory.HKLM else None
+
+    def EnumKey(self, hDefKey, sSubKeyName):
+        if self.result: return self.result, None
+        names = self.reader.subkeys(*self._key(hDefKey, sSubKeyName))
+        return (0, names) if names else (software_inventory.ERROR_FILE_NOT_FOUND, None)
+
+    def EnumValues(self, hDefKey, sSubKeyName):
+        if self.result: return self.result, None, None
+        values = self.reader.values(*self._key(hDefKey, sSubKeyName))
+        if not values: return software_inventory.ERROR_FILE_NOT_FOUND, None, None
+        types = [software_inventory.REG_DWORD if isinstance(value, int) else software_inventory.REG_SZ for value in values.values()]
+        return 0, list(values), types
+
+    def GetStringValue(self, hDefKey, sSubKeyName, sValueName):
+        if self.result: return self.result, None
+        return 0, self.reader.values(*self._key(hDefKey, sSubKeyName))[sValueName]
+
+    GetDWORDValue = GetStringValue
+
+class SimulatedWMI:
+    """Conexión WMI falsa: cada consulta duerme `latency` segundos (o lo indicado en `class_latency`).
+
+    Con `registry` (un DictRegistryReader), la conexión a REGISTRY_NAMESPACE
+    expone StdRegProv sobre ese registro; `registry_result` simula un código de error.
+    """
+    def __init__(self, namespace=None, latency=0.0, class_latency=None, traffic=None, registry=None, registry_result=0, **counts):
+        self.namespace = namespace
+        self.latency = latency
+        self.class_latency = class_latency or {}
+        self.traffic = traffic or Traffic()
+        self.registry = registry
+        self.registry_result = registry_result
+        self.counts = counts
+
+    def _fetch(self, wmi_class, fields=None):
+        objects = _objects(wmi_class, **self.counts)
+        time.sleep(self.class_latency.get(wmi_class, self.latency))
+        if fields is None:
+            filler = CLASS_PROPERTIES[wmi_class]
+            rows = [{**{f"Propiedad{i}": None for i in range(filler - len(vars(obj)))}, **vars(obj)} for obj in objects]
+        else:
+            rows = [{field: getattr(obj, field) for field in fields} for obj in objects]
+        self.traffic.record(wmi_class, sum(map(len, rows)))
+        return [SimulatedObject(wmi_class, row, self.traffic) for row in rows]
+
+    def query(self, wql):
+        match = WQL_PATTERN.match(wql.strip())
+        if not match: raise ValueError(f"WQL no válida: {wql}")
+        fields, wmi_class = match.group(1), match.group(2)
+        if wmi_class == "__NAMESPACE":
+            self.traffic.record(wmi_class, 0)
+            return []
+        return self._fetch(wmi_class, None if fields.strip() == "*" else [f.strip() for f in fields.split(",")])
+
+    def __getattr__(self, wmi_class):
+        if wmi_class == "StdRegProv" and self.registry is not None and self.namespace == software_inventory.REGISTRY_NAMESPACE:
+            return SimulatedStdRegProv(self.registry, self.registry_result)
+        # Acceso por clase, como c.Win32_Printer(): equivale a SELECT *
+        if not wmi_class.startswith(("Win32_", "MSFT_")): raise AttributeError(wmi_class)
+        return lambda **filters: self._fetch(wmi_class)
+
+def connection_factory(**options):
+    """Devuelve una fábrica compatible con collector.collect que abre conexiones simuladas.
+
+    Con `traffic=Traffic()` todas las conexiones acumulan sus contadores en el mismo objeto.
+    """
+    def connect(namespace=None):
+        return SimulatedWMI(namespace=namespace, **options)
+    return connect
+
+def pool_factory(opened=None, **options):
+    """Fábrica factory(host, namespace) para wmi_pool.ConnectionPool; cuenta en `opened` las conexiones por namespace."""
+    connect = connection_factory(**options)
+    def factory(host=None, namespace=None):
+        if opened is not None: opened[namespace] += 1
+        return connect(namespace)
+    return factory
+
+def host_factory(unreachable=(), hanging=(), flaky=(), hang_time=3600, **options):
+    """Fábrica por equipo para fleet.run_fleet: host -> connect(namespace=None).
+
+    Los equipos en `unreachable` siempre fallan al conectar, los de `hanging` se
+    cuelgan `hang_time` segundos y los de `flaky` fallan solo el primer intento.
+    """
+    attempts = collections.Counter()
+    lock = threading.Lock()
+    def factory(host):
+        base = connection_factory(**options)
+        def connect(namespace=None):
+            with lock: attempts[host] += 1; attempt = attempts[host]
+            if host in unreachable or (host in flaky and attempt == 1):
+                raise ConnectionError(f"El servidor RPC no está disponible: {host}")
+            if host in hanging: time.sleep(hang_time)
+            return base(namespace)
+        return connect
+    return factory
+
+def registry(entries=5000):
+    """Registro en memoria con `entries` programas repartidos entre HKLM 64/32 bits y HKCU, más duplicados y parches."""
+    uninstall = software_inventory.UNINSTALL_PATH
+    sources = software_inventory.UNINSTALL_SOURCES
+    tree = {source: {uninstall: {}} for source in sources}
+    for i in range(entries):
+        source = sources[i % 3]
+        values = {"DisplayName": f"Programa {i:05d}", "DisplayVersion": f"{i % 10}.{i % 7}.{i}", "Publisher": f"Proveedor {i % 40}"}
+        tree[source][uninstall][f"{{{i:08d}}}"] = values
+        if i % 10 == 0:
+            # Mismo programa visible en la otra vista de HKLM y un parche asociado
+            tree[sources[(i + 1) % 2]][uninstall][f"{{{i:08d}}}"] = values
+            tree[source][uninstall][f"KB{i}"] = {"DisplayName": f"Parche KB{i}", "ReleaseType": "Update"}
+    return software_inventory.DictRegistryReader(tree)